@@ -9,12 +9,24 @@ import sys
 if __name__ == "__main__":
     port = os.environ.get("PORT", "5000")
     bind = f"0.0.0.0:{port}"
+    # One process keeps the odds snapshot/caches shared; threads let long-lived requests
+    # (the /odds/stream SSE feed, slow LLM calls) run without blocking everyone else.
+    threads = os.environ.get("WEB_THREADS", "16")
+    # BETAI_SERVER_MODE=async: gevent worker. Sockets become cooperative, so slow OpenAI/Odds API calls
+    # and open SSE streams each park a cheap greenlet instead of holding an OS thread.
+    mode = (os.environ.get("BETAI_SERVER_MODE") or "threads").strip().lower()
+    if mode == "async":
+        connections = os.environ.get("WEB_CONNECTIONS", "1000")
+        worker = ["-k", "gevent", "--worker-connections", connections]
+    else:
+        worker = ["-k", "gthread", "--threads", threads]
     # Use same Python so gunicorn is found; bind to 0.0.0.0 so Render can detect the port
     sys.exit(
         subprocess.call([
             sys.executable,
             "-m", "gunicorn",
             "-w", "1",
+            *worker,
             "-b", bind,
             "server:app",
         ])
@@ -3,17 +3,32 @@ BetAI Advisor API — Chat by sport category + odds & predictions.
 Uses OpenAI for real LLM conversation when OPENAI_API_KEY is set; falls back to rule-based replies otherwise.
 Auth: signup/login with JWT; chats stored per user.
 """
+import calendar
+import contextvars
+import difflib
+import functools
 import json
 import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import List, Optional
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify, stream_with_context
 from flask_cors import CORS
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 import jwt
+import numpy as np
 from werkzeug.security import generate_password_hash, check_password_hash
 
 load_dotenv()
@@ -175,19 +190,458 @@ def save_users(users):
     USERS_FILE.write_text(json.dumps(users, indent=2))
 
 
-def fetch_odds_data(sport_key="basketball_nba", live_only=False, markets=None):
-    """Fetch odds for a sport. Use sport_key='upcoming' for live + next 8 across all sports.
-    markets: optional list e.g. ['h2h', 'spreads'] for analysis; default ['h2h']."""
+# ============================================================================
+# HTTP CLIENT (shared pooled session: keep-alive, retries, per-host limits)
+# ============================================================================
+
+# "threads" (gunicorn gthread) or "async" (gunicorn gevent: sockets are cooperative, so each
+# request / background thread is a greenlet and blocking I/O only parks that greenlet). Set by run.py.
+SERVER_MODE = (os.getenv("BETAI_SERVER_MODE") or "threads").strip().lower()
+ASYNC_MODE = SERVER_MODE == "async"
+
+# Per-endpoint (connect, read) timeouts in seconds
+HTTP_TIMEOUTS = {
+    "odds": (3.05, float(os.getenv("HTTP_TIMEOUT_ODDS", "12") or "12")),
+    "scores": (3.05, float(os.getenv("HTTP_TIMEOUT_SCORES", "10") or "10")),
+    "sports": (3.05, float(os.getenv("HTTP_TIMEOUT_SPORTS", "10") or "10")),
+    "thesportsdb": (3.05, float(os.getenv("HTTP_TIMEOUT_THESPORTSDB", "8") or "8")),
+    "espn": (3.05, float(os.getenv("HTTP_TIMEOUT_ESPN", "15") or "15")),
+}
+HTTP_DEFAULT_TIMEOUT = (3.05, 10)
+# Bounded retries with jittered exponential backoff on connection errors, 429 and 5xx
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "2") or "2")
+HTTP_BACKOFF_FACTOR = float(os.getenv("HTTP_BACKOFF_FACTOR", "0.5") or "0.5")
+HTTP_BACKOFF_JITTER = float(os.getenv("HTTP_BACKOFF_JITTER", "0.5") or "0.5")
+HTTP_RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Longest Retry-After (seconds) we sleep before retrying; larger values are clamped to this
+HTTP_RETRY_AFTER_MAX = float(os.getenv("HTTP_RETRY_AFTER_MAX", "5") or "5")
+# Keep-alive connection pool per upstream host: max pooled (and concurrent) connections
+HTTP_POOL_SIZES = {
+    "https://api.the-odds-api.com": int(os.getenv("HTTP_POOL_ODDS", "8") or "8"),
+    "https://www.thesportsdb.com": int(os.getenv("HTTP_POOL_THESPORTSDB", "4") or "4"),
+    "https://lm-api-reads.fantasy.espn.com": int(os.getenv("HTTP_POOL_ESPN", "4") or "4"),
+    "https://fantasy.espn.com": int(os.getenv("HTTP_POOL_ESPN", "4") or "4"),
+    "https://site.api.espn.com": int(os.getenv("HTTP_POOL_ESPN", "4") or "4"),
+}
+
+
+class _CappedRetry(Retry):
+    """Retry that honours Retry-After only up to HTTP_RETRY_AFTER_MAX, so a 429 asking for minutes
+    can't park a request thread (or the snapshot / ESPN refresh thread) for that long."""
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, HTTP_RETRY_AFTER_MAX)
+
+
+def _build_http_session() -> requests.Session:
+    retry = _CappedRetry(
+        total=HTTP_MAX_RETRIES,
+        status_forcelist=HTTP_RETRY_STATUSES,
+        allowed_methods=frozenset(["GET"]),
+        backoff_factor=HTTP_BACKOFF_FACTOR,
+        backoff_jitter=HTTP_BACKOFF_JITTER,
+        respect_retry_after_header=True,
+        raise_on_status=False,  # hand the final 429/5xx back to the caller instead of raising
+    )
+    session = requests.Session()
+    default_adapter = HTTPAdapter(max_retries=retry)
+    session.mount("https://", default_adapter)
+    session.mount("http://", default_adapter)
+    for host, size in HTTP_POOL_SIZES.items():
+        # pool_block: once a host's pool is exhausted, wait for a free connection instead of opening more
+        session.mount(host, HTTPAdapter(max_retries=retry, pool_connections=1, pool_maxsize=size, pool_block=True))
+    return session
+
+
+_http_session = _build_http_session()
+
+
+def http_get(url: str, endpoint: str, params: Optional[dict] = None, **kwargs) -> requests.Response:
+    """GET through the shared pooled session, using the timeout configured for endpoint."""
+    kwargs.setdefault("timeout", HTTP_TIMEOUTS.get(endpoint, HTTP_DEFAULT_TIMEOUT))
+    return _http_session.get(url, params=params, **kwargs)
+
+
+class _EspnRequestsShim:
+    """Stands in for the `requests` module inside espn_api so League objects reuse the shared session."""
+
+    @staticmethod
+    def get(url, **kwargs):
+        return http_get(url, "espn", **kwargs)
+
+
+try:
+    from espn_api.requests import espn_requests as _espn_requests_module
+    _espn_requests_module.requests = _EspnRequestsShim
+except ImportError:
+    pass
+
+
+# ============================================================================
+# ODDS API CACHE (in-process TTL cache with stale-while-revalidate)
+# ============================================================================
+
+# Seconds an Odds API response is considered fresh, per endpoint. Live odds move ~every 30s.
+ODDS_CACHE_TTLS = {
+    "odds": int(os.getenv("ODDS_CACHE_TTL_ODDS", "30") or "30"),
+    "scores": int(os.getenv("ODDS_CACHE_TTL_SCORES", "30") or "30"),
+    "sports": int(os.getenv("ODDS_CACHE_TTL_SPORTS", "3600") or "3600"),
+}
+# How long past its TTL an entry may still be served while a background refresh runs
+ODDS_CACHE_MAX_STALE = int(os.getenv("ODDS_CACHE_MAX_STALE", "300") or "300")
+
+
+class TTLCache:
+    """Thread-safe in-process cache with per-entry TTL and stale-while-revalidate.
+    Fresh entries are returned directly; stale entries (within max_stale) are returned
+    immediately while one background thread refreshes them; anything older is a miss."""
+
+    def __init__(self, max_stale: int = 300):
+        self.max_stale = max_stale
+        self._lock = threading.Lock()
+        self._entries = {}  # key -> (value, stored_at, ttl)
+        self._refreshing = set()
+        self._counters = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "refresh_errors": 0}
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counters[name] += 1
+
+    def _store(self, key, value, ttl: int):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic(), ttl)
+
+    def _refresh_in_background(self, key, ttl: int, fetch, cacheable):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def run():
+            try:
+                value = fetch()
+                if cacheable(value):
+                    self._store(key, value, ttl)
+                    self._count("refreshes")
+                else:
+                    self._count("refresh_errors")
+            except Exception as e:
+                self._count("refresh_errors")
+                print(f"[cache] refresh {key!r} failed: {e!r}", flush=True)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=run, name="cache-refresh", daemon=True).start()
+
+    def get_or_fetch(self, key, ttl: int, fetch, cacheable=lambda v: True):
+        """Return the cached value for key, calling fetch() on a miss. Only values for which
+        cacheable(value) is true are stored (so upstream errors are never cached)."""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None:
+            value, stored_at, entry_ttl = entry
+            age = time.monotonic() - stored_at
+            if age < entry_ttl:
+                self._count("hits")
+                return value
+            if age < entry_ttl + self.max_stale:
+                self._count("stale_hits")
+                self._refresh_in_background(key, ttl, fetch, cacheable)
+                return value
+        self._count("misses")
+        value = fetch()
+        if cacheable(value):
+            self._store(key, value, ttl)
+        return value
+
+    def peek(self, key):
+        """Return the cached value for key regardless of age (None if absent), without counting a lookup."""
+        with self._lock:
+            entry = self._entries.get(key)
+        return entry[0] if entry is not None else None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Hit/miss counters plus the age (seconds) of every cached entry."""
+        now = time.monotonic()
+        with self._lock:
+            counters = dict(self._counters)
+            ages = {
+                "/".join(str(k) for k in key if k is not None): round(now - stored_at, 1)
+                for key, (_, stored_at, _) in self._entries.items()
+            }
+        lookups = counters["hits"] + counters["stale_hits"] + counters["misses"]
+        counters["hit_rate"] = round((counters["hits"] + counters["stale_hits"]) / lookups, 3) if lookups else None
+        counters["entries"] = len(ages)
+        counters["entry_age_seconds"] = ages
+        return counters
+
+
+_odds_cache = TTLCache(max_stale=ODDS_CACHE_MAX_STALE)
+
+
+class SingleFlight:
+    """Coalesce concurrent identical upstream calls: the first caller for a key runs the fetch,
+    callers arriving while it is in flight wait for it and receive the same result (or error)."""
+
+    class _Call:
+        __slots__ = ("done", "result", "error")
+
+        def __init__(self):
+            self.done = threading.Event()
+            self.result = None
+            self.error = None
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}  # key -> _Call
+        self._counters = {"executed": 0, "coalesced": 0}
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = SingleFlight._Call()
+                self._counters["executed"] += 1
+            else:
+                self._counters["coalesced"] += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._counters, in_flight=len(self._calls))
+
+
+_upstream_flights = SingleFlight()
+
+
+def _freeze(value):
+    """Hashable stand-in for an argument value (lists/tuples -> tuples, dicts -> sorted item tuples, sets -> frozensets)."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, set):
+        return frozenset(_freeze(v) for v in value)
+    return value
+
+
+def _call_key(name: str, args: tuple, kwargs: dict) -> tuple:
+    """Memo / single-flight key for a call; list- and dict-valued arguments are frozen first.
+
+    >>> key = _call_key("fetch_odds_data", ("basketball",), {"markets": ["h2h", "spreads"]})
+    >>> key == _call_key("fetch_odds_data", ("basketball",), {"markets": ("h2h", "spreads")})
+    True
+    >>> hash(_call_key("f", ([1, {"a": [2]}],), {})) is not None
+    True
+    """
+    return (name, _freeze(args), tuple(sorted((k, _freeze(v)) for k, v in kwargs.items())))
+
+
+def coalesced(fn):
+    """Decorator: concurrent calls to fn with identical arguments share one in-flight upstream request."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        key = _call_key(fn.__name__, args, kwargs)
+        return _upstream_flights.do(key, lambda: fn(*args, **kwargs))
+    return wrapper
+
+
+class RequestMemo:
+    """Per-request memo: each distinct upstream resource is fetched at most once while serving one
+    request, even when several context stages ask for it concurrently."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}  # key -> SingleFlight._Call
+        self.fetched = 0
+        self.saved = 0
+
+    def get_or_call(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            owner = call is None
+            if owner:
+                call = self._calls[key] = SingleFlight._Call()
+                self.fetched += 1
+            else:
+                self.saved += 1
+        if not owner:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            call.done.set()
+
+
+_request_memo = contextvars.ContextVar("request_memo", default=None)
+_memo_totals = {"requests": 0, "fetched": 0, "saved": 0}
+_memo_totals_lock = threading.Lock()
+
+
+def request_memoized(fn):
+    """Decorator: within one request, repeat calls with the same arguments reuse the first result.
+    Outside a request (background threads, scripts) calls pass straight through."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        memo = _request_memo.get()
+        if memo is None:
+            return fn(*args, **kwargs)
+        key = _call_key(fn.__name__, args, kwargs)
+        return memo.get_or_call(key, lambda: fn(*args, **kwargs))
+    return wrapper
+
+
+def begin_request_memo():
+    return _request_memo.set(RequestMemo())
+
+
+def end_request_memo(token, label: str = ""):
+    memo = _request_memo.get()
+    try:
+        _request_memo.reset(token)
+    except ValueError:
+        # Streaming responses finish in a different context than the one that opened the memo
+        _request_memo.set(None)
+    if memo is None or not memo.fetched:
+        return
+    with _memo_totals_lock:
+        _memo_totals["requests"] += 1
+        _memo_totals["fetched"] += memo.fetched
+        _memo_totals["saved"] += memo.saved
+    if memo.saved:
+        print(f"[memo] {label}: {memo.fetched} fetched, {memo.saved} duplicate calls saved", flush=True)
+
+
+# Stop polling the Odds API in the background once this many requests are left this month
+ODDS_QUOTA_RESERVE = int(os.getenv("ODDS_QUOTA_RESERVE", "25") or "25")
+
+
+class OddsQuota:
+    """Tracks Odds API usage from the x-requests-used / x-requests-remaining / x-requests-last
+    response headers (the API bills per request x markets x regions, reset monthly)."""
+
+    def __init__(self, reserve: int):
+        self.reserve = reserve
+        self._lock = threading.Lock()
+        self.used = None
+        self.remaining = None
+        self.last_cost = None
+        self.updated_at = None
+        self.pace_multiplier = 1.0
+        self._cost_by_sport = {}
+        self._last_cost = {}  # (sport_key, kind) -> credits charged by the latest such request
+
+    def record(self, headers, sport_key: str, kind: str = "odds"):
+        def _num(name):
+            try:
+                return float(headers.get(name))
+            except (TypeError, ValueError):
+                return None
+        used, remaining, last = _num("x-requests-used"), _num("x-requests-remaining"), _num("x-requests-last")
+        if used is None and remaining is None:
+            return
+        with self._lock:
+            self.used, self.remaining, self.last_cost = used, remaining, last
+            self.updated_at = time.time()
+            if last is not None:
+                self._last_cost[(sport_key, kind)] = last
+            if last:
+                self._cost_by_sport[sport_key] = self._cost_by_sport.get(sport_key, 0) + last
+
+    def cost_of(self, sport_key: str, kind: str, default: float) -> float:
+        """Measured credits for one (sport_key, kind) request; default until one has been made."""
+        with self._lock:
+            return self._last_cost.get((sport_key, kind), default)
+
+    def exhausted(self, keep_reserve: bool = False) -> bool:
+        """True when we should stop spending requests and serve cached data instead.
+        keep_reserve (background polling) stops ODDS_QUOTA_RESERVE credits early so user requests can spend them."""
+        with self._lock:
+            floor = self.reserve if keep_reserve else 0
+            return self.remaining is not None and self.remaining <= floor
+
+    def budget_multiplier(self, spend_rate: float) -> float:
+        """How much to stretch background poll intervals so that polling which costs spend_rate credits
+        per second at the base intervals fits in the credits above the reserve until the month ends."""
+        with self._lock:
+            remaining = self.remaining
+        multiplier = 1.0
+        if remaining is not None and spend_rate > 0:
+            now = datetime.now(timezone.utc)
+            month_end = datetime(now.year, now.month, calendar.monthrange(now.year, now.month)[1], tzinfo=timezone.utc)
+            seconds_left = max(60.0, (month_end - now).total_seconds() + 86400)
+            allowed_rate = max(remaining - self.reserve, 1.0) / seconds_left
+            multiplier = max(1.0, spend_rate / allowed_rate)
+        with self._lock:
+            self.pace_multiplier = multiplier
+        return multiplier
+
+    def state(self) -> dict:
+        with self._lock:
+            info = {
+                "used": self.used,
+                "remaining": self.remaining,
+                "last_request_cost": self.last_cost,
+                "reserve": self.reserve,
+                "cost_by_sport": dict(self._cost_by_sport),
+                "updated_age_seconds": round(time.time() - self.updated_at, 1) if self.updated_at else None,
+            }
+        info["exhausted"] = self.exhausted()
+        info["background_paused"] = self.exhausted(keep_reserve=True)
+        info["budget_multiplier"] = round(self.pace_multiplier, 2)
+        return info
+
+
+_odds_quota = OddsQuota(ODDS_QUOTA_RESERVE)
+
+
+def _is_odds_payload(value) -> bool:
+    """Odds/scores/sports responses are lists; error dicts and failed fetches (None) are not cached."""
+    return isinstance(value, list)
+
+
+@coalesced
+def _fetch_odds_data_uncached(sport_key: str, markets: str, regions: str):
     url = ODDS_API_URL.format(sport_key=sport_key)
-    m = (markets or ["h2h"])
     params = {
         "apiKey": ODDS_API_KEY,
-        "regions": "us",
-        "markets": ",".join(m) if isinstance(m, list) else m,
+        "regions": regions,
+        "markets": markets,
         "oddsFormat": "decimal",
     }
     try:
-        r = requests.get(url, params=params, timeout=12)
+        r = http_get(url, "odds", params=params)
+        _odds_quota.record(r.headers, sport_key, f"odds:{markets}:{regions}")
         if r.status_code == 200:
             return r.json()
     except Exception as e:
@@ -195,79 +649,767 @@ def fetch_odds_data(sport_key="basketball_nba", live_only=False, markets=None):
     return {"error": f"API Error: {r.status_code}"}
 
 
-def fetch_scores(sport_key="upcoming", days_from=1):
-    """Fetch live and recent scores (in-play + completed). Used to show current score alongside odds.
-    Odds API: live odds update ~every 30s during games; scores endpoint gives current/last score."""
+@request_memoized
+def fetch_odds_data(sport_key="basketball_nba", live_only=False, markets=None, regions="us"):
+    """Fetch odds for a sport. Use sport_key='upcoming' for live + next 8 across all sports.
+    markets: optional list e.g. ['h2h', 'spreads'] for analysis; default ['h2h'].
+    Responses are cached per (sport_key, markets, regions) for ODDS_CACHE_TTLS['odds'] seconds;
+    once the monthly quota is exhausted only cached data (of any age) is returned."""
+    m = (markets or ["h2h"])
+    markets_str = ",".join(m) if isinstance(m, list) else m
+    key = ("odds", sport_key, markets_str, regions)
+    if _odds_quota.exhausted():
+        cached = _odds_cache.peek(key)
+        return cached if cached is not None else {"error": "Odds API request quota exhausted for this month"}
+    return _odds_cache.get_or_fetch(
+        key,
+        ODDS_CACHE_TTLS["odds"],
+        lambda: _fetch_odds_data_uncached(sport_key, markets_str, regions),
+        _is_odds_payload,
+    )
+
+
+@coalesced
+def _fetch_scores_uncached(sport_key: str, days_from):
     url = ODDS_SCORES_URL.format(sport_key=sport_key)
     params = {"apiKey": ODDS_API_KEY}
     if days_from is not None:
         params["daysFrom"] = days_from
     try:
-        r = requests.get(url, params=params, timeout=10)
+        r = http_get(url, "scores", params=params)
+        _odds_quota.record(r.headers, sport_key, f"scores:{days_from}")
         if r.status_code == 200:
             return r.json()
     except Exception:
-        return []
-    return []
+        return None
+    return None
 
 
+@request_memoized
+def fetch_scores(sport_key="upcoming", days_from=1):
+    """Fetch live and recent scores (in-play + completed). Used to show current score alongside odds.
+    Odds API: live odds update ~every 30s during games; scores endpoint gives current/last score."""
+    key = ("scores", sport_key, days_from)
+    if _odds_quota.exhausted():
+        return _odds_cache.peek(key) or []
+    data = _odds_cache.get_or_fetch(
+        key,
+        ODDS_CACHE_TTLS["scores"],
+        lambda: _fetch_scores_uncached(sport_key, days_from),
+        _is_odds_payload,
+    )
+    return data or []
+
+
+class LiveBoard:
+    """Live/upcoming board kept joined across calls. Odds rows are rendered once per odds frame; the
+    scores index (event id -> score text) is updated in place from each scores feed, and only events
+    whose score changed are re-joined."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._frame = None
+        self._rows = []  # (title, item) in feed order
+        self._row_by_id = {}  # event id -> index into _rows
+        self._scores_source = None
+        self._scores = {}  # event id -> "home-away (Live|FT)"
+        self._result = None
+
+    @staticmethod
+    def _score_text(ev: dict):
+        home_s, away_s = _score_pair(ev)
+        if home_s is None or away_s is None:
+            return None
+        return f"{home_s}-{away_s}" + (" (FT)" if ev.get("completed") else " (Live)")
+
+    def _update_scores(self, scores_list: list) -> set:
+        """Apply a scores feed to the index; return ids whose score text changed."""
+        if scores_list is self._scores_source:
+            return set()
+        self._scores_source = scores_list
+        seen, changed = set(), set()
+        for ev in scores_list or []:
+            eid = ev.get("id")
+            if not eid:
+                continue
+            text = self._score_text(ev)
+            if text is None:
+                continue
+            seen.add(eid)
+            if self._scores.get(eid) != text:
+                self._scores[eid] = text
+                changed.add(eid)
+        for eid in [eid for eid in self._scores if eid not in seen]:
+            del self._scores[eid]
+            changed.add(eid)
+        return changed
+
+    def _render(self, frame: "OddsFrame"):
+        rows, row_by_id = [], {}
+        for i, rec in enumerate(frame.events):
+            sk = rec.sport_key
+            title = SPORT_TITLES.get(sk, sk.replace("_", " ").title())
+            bc = frame.first_h2h_book(i, first_only=True)
+            if bc is None:
+                rows.append((title, None))  # keeps the sport heading even without prices
+                continue
+            item = {
+                "match": f"{rec.home_team or '?'} vs {rec.away_team or '?'}",
+                "odds": ", ".join(f"{name}: {price}" for name, price in frame.h2h_quotes(i, bc)),
+                "commence": rec.commence_time[:16].replace("T", " "),
+            }
+            if rec.id and rec.id in self._scores:
+                item["score"] = self._scores[rec.id]
+            if rec.id:
+                row_by_id[rec.id] = len(rows)
+            rows.append((title, item))
+        self._frame, self._rows, self._row_by_id = frame, rows, row_by_id
+
+    def _join(self, changed: set):
+        for eid in changed:
+            idx = self._row_by_id.get(eid)
+            if idx is None:
+                continue
+            title, item = self._rows[idx]
+            # Copy on write: earlier results handed to callers stay untouched
+            item = {k: v for k, v in item.items() if k != "score"}
+            if eid in self._scores:
+                item["score"] = self._scores[eid]
+            self._rows[idx] = (title, item)
+
+    def board(self, frame: "OddsFrame", scores_list: list) -> dict:
+        with self._lock:
+            changed = self._update_scores(scores_list)
+            if frame is not self._frame:
+                self._render(frame)
+            elif changed:
+                self._join(changed)
+            else:
+                return self._result
+            by_sport = {}
+            for title, item in self._rows:
+                items = by_sport.setdefault(title, [])
+                if item is not None:
+                    items.append(item)
+            self._result = by_sport
+            return by_sport
+
+
+_live_board = LiveBoard()
+# Scores are fetched alongside the odds so the reply waits for one upstream round-trip, not two
+_live_join_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="live-join")
+
+
+@request_memoized
+@coalesced
 def fetch_live_upcoming_odds():
     """
     Fetch live and upcoming games across all sports (Odds API sport_key='upcoming').
     Enriches with live/recent scores when available (Scores API). Odds update ~every 30s when in-play.
     Returns games grouped by sport for conversational display.
     """
-    data = fetch_odds_data("upcoming")
+    # Scores for in-play and recently completed (same API; keyed by event id)
+    scores_future = _live_join_executor.submit(contextvars.copy_context().run, current_scores, "upcoming")
+    data = current_odds("upcoming")
     if isinstance(data, dict) and "error" in data:
         return data
-    # Fetch scores for in-play and recently completed (same API; scores have event id, home_score, away_score)
-    scores_list = fetch_scores("upcoming", days_from=1)
-    scores_by_id = {}
-    for ev in scores_list or []:
-        eid = ev.get("id")
-        if not eid:
-            continue
-        home_s = ev.get("home_score")
-        away_s = ev.get("away_score")
-        completed = ev.get("completed", False)
-        if home_s is not None and away_s is not None:
-            scores_by_id[eid] = {"home": home_s, "away": away_s, "completed": completed}
-    by_sport = {}
-    for event in data or []:
-        sk = event.get("sport_key", "other")
-        title = SPORT_TITLES.get(sk, sk.replace("_", " ").title())
-        if title not in by_sport:
-            by_sport[title] = []
-        home = event.get("home_team", "?")
-        away = event.get("away_team", "?")
-        commence = event.get("commence_time", "")[:16].replace("T", " ")
-        score_str = None
-        eid = event.get("id")
-        if eid and eid in scores_by_id:
-            s = scores_by_id[eid]
-            score_str = f"{s['home']}-{s['away']}" + (" (FT)" if s.get("completed") else " (Live)")
-        for b in event.get("bookmakers", [])[:1]:
-            for m in b.get("markets", []):
-                if m.get("key") != "h2h":
-                    continue
-                odds_str = ", ".join(f"{o['name']}: {o['price']}" for o in m.get("outcomes", []))
-                item = {"match": f"{home} vs {away}", "odds": odds_str, "commence": commence}
-                if score_str:
-                    item["score"] = score_str
-                by_sport[title].append(item)
-                break
-            break
-    return by_sport
+    try:
+        scores_list = scores_future.result()
+    except Exception as e:
+        print(f"[live] scores fetch failed: {e}", flush=True)
+        scores_list = []
+    return _live_board.board(odds_frame(data or []), scores_list)
 
 
-def fetch_all_sports():
+@coalesced
+def _fetch_all_sports_uncached():
     try:
-        r = requests.get(SPORTS_API_URL, params={"apiKey": ODDS_API_KEY}, timeout=10)
+        # /sports is free, so it stays out of the quota's per-sport cost table
+        r = http_get(SPORTS_API_URL, "sports", params={"apiKey": ODDS_API_KEY})
         if r.status_code == 200:
             return r.json()
-    except Exception as e:
-        return []
-    return []
+    except Exception:
+        return None
+    return None
+
+
+def fetch_all_sports():
+    data = _odds_cache.get_or_fetch(
+        ("sports",),
+        ODDS_CACHE_TTLS["sports"],
+        _fetch_all_sports_uncached,
+        _is_odds_payload,
+    )
+    return data or []
+
+
+# ============================================================================
+# ODDS SNAPSHOT SERVICE (background refresher; request handlers read from memory)
+# ============================================================================
+
+ODDS_SNAPSHOT_ENABLED = os.getenv("ODDS_SNAPSHOT_ENABLED", "true").strip().lower() == "true"
+# Base refresh interval (seconds) per sport state; stretched by OddsQuota.budget_multiplier() to fit the quota
+ODDS_POLL_LIVE = int(os.getenv("ODDS_POLL_LIVE", "30") or "30")  # a game is in play
+ODDS_POLL_PREGAME = int(os.getenv("ODDS_POLL_PREGAME", "300") or "300")  # events listed, none started
+ODDS_POLL_IDLE = int(os.getenv("ODDS_POLL_IDLE", "3600") or "3600")  # no events: effectively paused
+ODDS_SCHEDULER_TICK = 5
+# Sport feeds carry spreads too (used by in-depth analysis); h2h-only consumers ignore the extra market
+SNAPSHOT_SPORT_MARKETS = ["h2h", "spreads"]
+SNAPSHOT_UPCOMING_MARKETS = ["h2h"]
+
+
+def _parse_commence(value: str) -> Optional[float]:
+    """Odds API commence_time (ISO 8601, UTC) -> epoch seconds."""
+    try:
+        return datetime.fromisoformat((value or "").replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+class OddsScheduler:
+    """Decides when each sport is next refreshed: fast while a game is in play, slower pre-game,
+    paused when the sport has no events, and stretched or stopped as the monthly quota runs low."""
+
+    def __init__(self, quota: OddsQuota):
+        self.quota = quota
+        self._lock = threading.Lock()
+        self._next_due = {}  # sport_key -> monotonic time
+        self._state = {}  # sport_key -> "live" | "pregame" | "idle" | "error"
+
+    @staticmethod
+    def classify(events) -> str:
+        if not isinstance(events, list):
+            return "error"
+        if not events:
+            return "idle"
+        now = time.time()
+        for e in events:
+            start = _parse_commence(e.get("commence_time"))
+            if start is not None and start <= now:
+                return "live"
+        return "pregame"
+
+    def base_interval(self, state: str) -> int:
+        if state == "live":
+            return ODDS_POLL_LIVE
+        if state == "idle":
+            return ODDS_POLL_IDLE
+        return ODDS_POLL_PREGAME
+
+    def cycle_cost(self, sport_key: str, state: str) -> float:
+        """Credits one background refresh of sport_key costs in this state (measured once it has run)."""
+        markets = OddsSnapshot.markets_for(sport_key)
+        cost = self.quota.cost_of(sport_key, f"odds:{','.join(markets)}:us", len(markets))
+        if state == "live":
+            cost += self.quota.cost_of(sport_key, "scores:1", 2)
+        return cost
+
+    def spend_rate(self) -> float:
+        """Credits per second the snapshot would spend polling every sport at its base interval."""
+        with self._lock:
+            states = dict(self._state)
+        rate = 0.0
+        for sport_key in OddsSnapshot.sport_keys():
+            state = states.get(sport_key, "pregame")
+            rate += self.cycle_cost(sport_key, state) / self.base_interval(state)
+        return rate
+
+    def due(self, sport_keys: list) -> list:
+        """Sports whose refresh is due now (none once only the reserve is left)."""
+        if self.quota.exhausted(keep_reserve=True):
+            return []
+        now = time.monotonic()
+        with self._lock:
+            return [k for k in sport_keys if self._next_due.get(k, 0) <= now]
+
+    def is_live(self, sport_key: str) -> bool:
+        with self._lock:
+            return self._state.get(sport_key) == "live"
+
+    def schedule(self, sport_key: str, events):
+        state = self.classify(events)
+        with self._lock:
+            self._state[sport_key] = state
+        interval = self.base_interval(state)
+        if self.cycle_cost(sport_key, state) > 0:  # empty feeds are free; only paid polls are stretched
+            interval *= self.quota.budget_multiplier(self.spend_rate())
+        with self._lock:
+            self._next_due[sport_key] = time.monotonic() + interval
+
+    def state(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                k: {"state": self._state.get(k), "next_refresh_in": round(max(0.0, due - now), 1)}
+                for k, due in self._next_due.items()
+            }
+
+
+_odds_scheduler = OddsScheduler(_odds_quota)
+
+
+class OddsSnapshot:
+    """Versioned in-memory snapshot of odds and scores for every sport in SPORT_KEY_MAP plus the
+    'upcoming' feed. A daemon thread refreshes it; readers never wait on the Odds API.
+    A failed refresh keeps the last good data, so readers only see an error if there never was any."""
+
+    def __init__(self, scheduler: OddsScheduler):
+        self.scheduler = scheduler
+        self.version = 0
+        self._lock = threading.Lock()
+        self._odds = {}  # sport_key -> list of events (or {"error": ...} if never loaded)
+        self._scores = {}  # sport_key -> list of score events
+        self._updated_at = {}  # sport_key -> epoch seconds of last successful odds refresh
+        self._thread = None
+
+    @staticmethod
+    def sport_keys() -> list:
+        return sorted(set(SPORT_KEY_MAP.values())) + ["upcoming"]
+
+    @staticmethod
+    def markets_for(sport_key: str) -> list:
+        return SNAPSHOT_UPCOMING_MARKETS if sport_key == "upcoming" else SNAPSHOT_SPORT_MARKETS
+
+    def odds(self, sport_key: str, markets: Optional[list] = None):
+        """Snapshot odds for sport_key, or None when not loaded or missing one of the requested markets."""
+        if markets and not set(markets) <= set(self.markets_for(sport_key)):
+            return None
+        with self._lock:
+            return self._odds.get(sport_key)
+
+    def scores(self, sport_key: str):
+        with self._lock:
+            return self._scores.get(sport_key)
+
+    def refresh(self, sport_key: str):
+        odds = _fetch_odds_data_uncached(sport_key, ",".join(self.markets_for(sport_key)), "us")
+        self.scheduler.schedule(sport_key, odds)
+        # Scores cost quota too; they only change while a game is in play
+        scores = _fetch_scores_uncached(sport_key, 1) if self.scheduler.is_live(sport_key) else None
+        with self._lock:
+            if isinstance(odds, list):
+                self._odds[sport_key] = odds
+                self._updated_at[sport_key] = time.time()
+            elif sport_key not in self._odds:
+                self._odds[sport_key] = odds
+            if isinstance(scores, list):
+                self._scores[sport_key] = scores
+            self.version += 1
+        if ODDS_HISTORY_ENABLED and isinstance(odds, list):
+            try:
+                _odds_history.append(odds)
+            except OSError as e:
+                print(f"[history] append failed: {e!r}", flush=True)
+        _odds_stream.publish_changes(sport_key, odds, scores)
+        if isinstance(odds, list):
+            team_index(odds_frame(odds))  # matchup lookups on this snapshot never pay for the alias build
+
+    def refresh_due(self):
+        for sport_key in self.scheduler.due(self.sport_keys()):
+            try:
+                self.refresh(sport_key)
+            except Exception as e:
+                print(f"[snapshot] refresh {sport_key} failed: {e!r}", flush=True)
+
+    def _run(self):
+        while True:
+            self.refresh_due()
+            time.sleep(ODDS_SCHEDULER_TICK)
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="odds-snapshot", daemon=True)
+        self._thread.start()
+
+    def info(self) -> dict:
+        now = time.time()
+        with self._lock:
+            return {
+                "running": self._thread is not None,
+                "version": self.version,
+                "age_seconds": {k: round(now - t, 1) for k, t in self._updated_at.items()},
+            }
+
+
+# ============================================================================
+# ODDS HISTORY (append-only fixed-width records, one segment per UTC day)
+# ============================================================================
+
+ODDS_HISTORY_ENABLED = os.getenv("ODDS_HISTORY_ENABLED", "true").strip().lower() == "true"
+ODDS_HISTORY_DIR = DATA_DIR / "odds_history"
+ODDS_HISTORY_RETENTION_DAYS = int(os.getenv("ODDS_HISTORY_RETENTION_DAYS", "30") or "30")
+HISTORY_MARKETS = {"h2h": 0, "spreads": 1}
+HISTORY_MARKET_NAMES = {v: k for k, v in HISTORY_MARKETS.items()}
+# 125-byte records; strings are truncated to their field width
+HISTORY_DTYPE = np.dtype([
+    ("ts", "<u4"),  # epoch seconds
+    ("event", "S32"),  # Odds API event id (32 hex chars)
+    ("book", "S32"),  # bookmaker title
+    ("outcome", "S48"),
+    ("market", "u1"),
+    ("price", "<f4"),
+    ("point", "<f4"),  # spread line; NaN for h2h
+])
+
+
+class OddsHistoryStore:
+    """Append-only on-disk time series of odds quotes under DATA_DIR/odds_history/YYYYMMDD.bin.
+    Only quotes that changed since they were last written are appended. Reads memory-map the
+    segments and filter with NumPy, so a query never loads the archive into Python objects."""
+
+    def __init__(self, directory: Path, retention_days: int):
+        self.directory = directory
+        self.retention_days = retention_days
+        self._lock = threading.Lock()
+        self._last = {}  # event -> {(book, outcome, market): (price, point) last written}
+        self._seen = {}  # event -> epoch seconds it was last in any feed
+        self._segment_day = None
+
+    def _segment(self, day: str) -> Path:
+        return self.directory / f"{day}.bin"
+
+    def _prune(self):
+        cutoff = time.strftime("%Y%m%d", time.gmtime(time.time() - self.retention_days * 86400))
+        for path in self.directory.glob("*.bin"):
+            if path.stem < cutoff:
+                path.unlink(missing_ok=True)
+
+    def _forget_stale(self, cutoff: float):
+        """Drop the last-written quotes of events no feed has listed since cutoff (finished games),
+        so the de-dup map tracks live events only instead of growing for the life of the process."""
+        for eid in [eid for eid, seen in self._seen.items() if seen < cutoff]:
+            del self._seen[eid]
+            self._last.pop(eid, None)
+
+    def append(self, events) -> int:
+        """Append changed quotes from an odds feed; returns the number of records written."""
+        if not isinstance(events, list) or not events:
+            return 0
+        now = int(time.time())
+        rows = []
+        with self._lock:
+            for e in events:
+                eid = e.get("id")
+                if not eid:
+                    continue
+                self._seen[eid] = now
+                last = self._last.setdefault(eid, {})
+                for b in e.get("bookmakers", []):
+                    book = b.get("title") or b.get("key") or "?"
+                    for m in b.get("markets", []):
+                        code = HISTORY_MARKETS.get(m.get("key"))
+                        if code is None:
+                            continue
+                        for o in m.get("outcomes", []):
+                            price = o.get("price")
+                            if not price:
+                                continue
+                            point = o.get("point")
+                            key = (book, o.get("name", ""), code)
+                            value = (float(price), None if point is None else float(point))
+                            if last.get(key) == value:
+                                continue
+                            last[key] = value
+                            rows.append((now, eid.encode()[:32], book.encode()[:32], key[1].encode()[:48], code,
+                                         value[0], np.nan if value[1] is None else value[1]))
+            if not rows:
+                return 0
+            day = time.strftime("%Y%m%d", time.gmtime(now))
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(self._segment(day), "ab") as f:
+                f.write(np.array(rows, dtype=HISTORY_DTYPE).tobytes())
+            if day != self._segment_day:
+                self._segment_day = day
+                self._prune()
+                self._forget_stale(now - 86400)
+        return len(rows)
+
+    def query(self, event_id: str, days: int = 7, market: str = "h2h") -> dict:
+        """Price history for one event: {book: {outcome: [[iso time, price, point], ...]}}."""
+        code = HISTORY_MARKETS.get(market, 0)
+        target = event_id.encode()[:32]
+        out = {}
+        now = time.time()
+        for d in range(days - 1, -1, -1):
+            path = self._segment(time.strftime("%Y%m%d", time.gmtime(now - d * 86400)))
+            if not path.exists() or path.stat().st_size < HISTORY_DTYPE.itemsize:
+                continue
+            records = np.memmap(path, dtype=HISTORY_DTYPE, mode="r",
+                                shape=(path.stat().st_size // HISTORY_DTYPE.itemsize,))
+            hits = records[(records["event"] == target) & (records["market"] == code)]
+            for r in hits:
+                book = r["book"].decode(errors="replace")
+                outcome = r["outcome"].decode(errors="replace")
+                point = None if np.isnan(r["point"]) else round(float(r["point"]), 2)
+                out.setdefault(book, {}).setdefault(outcome, []).append([
+                    time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(int(r["ts"]))),
+                    round(float(r["price"]), 3),
+                    point,
+                ])
+            del records
+        return out
+
+    def stats(self) -> dict:
+        segments = sorted(self.directory.glob("*.bin")) if self.directory.exists() else []
+        size = sum(p.stat().st_size for p in segments)
+        return {"segments": len(segments), "records": size // HISTORY_DTYPE.itemsize, "bytes": size}
+
+
+_odds_history = OddsHistoryStore(ODDS_HISTORY_DIR, ODDS_HISTORY_RETENTION_DAYS)
+
+
+def line_movement_summary(frame: "OddsFrame", indices: list) -> str:
+    """First recorded vs latest moneyline per outcome and bookmaker (books whose price moved)."""
+    blocks = []
+    for i in indices:
+        rec = frame.events[i]
+        history = _odds_history.query(rec.id) if rec.id else {}
+        if not history:
+            continue
+        lines = [f"{rec.home_team} vs {rec.away_team}:"]
+        for outcome in rec.outcomes:
+            moves = []
+            for book, by_outcome in history.items():
+                series = by_outcome.get(outcome, [])
+                if len(series) >= 2 and series[0][1] != series[-1][1]:
+                    first, last = series[0], series[-1]
+                    moves.append(f"{first[1]} → {last[1]} at {book} (since {first[0][:16].replace('T', ' ')})")
+            if moves:
+                lines.append(f"  {outcome}: " + "; ".join(moves[:3]))
+        if len(lines) > 1:
+            blocks.append("\n".join(lines))
+    if not blocks:
+        return ""
+    return "Line movement (moneyline, first recorded → latest, times UTC):\n" + "\n".join(blocks)
+
+
+# ============================================================================
+# END ODDS HISTORY
+# ============================================================================
+
+
+# ============================================================================
+# LIVE ODDS STREAM (Server-Sent Events: per-refresh price and score deltas)
+# ============================================================================
+
+# Threaded mode: each open stream pins a server thread. Async mode: a stream is just an idle greenlet.
+_DEFAULT_STREAM_SUBSCRIBERS = "500" if ASYNC_MODE else "8"
+ODDS_STREAM_MAX_SUBSCRIBERS = int(os.getenv("ODDS_STREAM_MAX_SUBSCRIBERS", _DEFAULT_STREAM_SUBSCRIBERS) or _DEFAULT_STREAM_SUBSCRIBERS)
+ODDS_STREAM_KEEPALIVE = 15  # seconds between keep-alive comments
+
+
+def _score_pair(ev: dict):
+    """(home, away) score from a Scores API event (home_score/away_score or the scores list)."""
+    home_s, away_s = ev.get("home_score"), ev.get("away_score")
+    if home_s is None or away_s is None:
+        by_name = {s.get("name"): s.get("score") for s in ev.get("scores") or []}
+        home_s, away_s = by_name.get(ev.get("home_team")), by_name.get(ev.get("away_team"))
+    return home_s, away_s
+
+
+class OddsStream:
+    """Fans out odds/score changes to SSE subscribers. Each snapshot refresh is diffed against the
+    previous one for that feed, so subscribers receive only changed prices and scores and share the
+    single background poll."""
+
+    def __init__(self, max_subscribers: int):
+        self.max_subscribers = max_subscribers
+        self._lock = threading.Lock()
+        self._subscribers = []  # (queue, set of sport_keys or None for all)
+        self._quotes = {}  # feed sport_key -> {(event_id, book, outcome): price}
+        self._events = {}  # feed sport_key -> {event_id: event sport_key}
+        self._scores = {}  # feed sport_key -> {event_id: (home, away, completed)}
+
+    def subscribe(self, sport_keys: Optional[set]):
+        q = queue.Queue(maxsize=100)
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                return None
+            self._subscribers.append((q, sport_keys))
+        return q
+
+    def unsubscribe(self, q):
+        with self._lock:
+            self._subscribers = [(sq, keys) for sq, keys in self._subscribers if sq is not q]
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    @staticmethod
+    def quote_map(events: list) -> dict:
+        quotes = {}
+        frame = odds_frame(events)
+        for i, rec in enumerate(frame.events):
+            for bc in rec.books:
+                for name, price in frame.h2h_quotes(i, bc):
+                    quotes[(rec.id, frame.book_titles[bc], name)] = (price, rec)
+        return quotes
+
+    def publish_changes(self, feed_key: str, events, scores):
+        """Diff a refreshed feed against the previous one and push the changes to subscribers."""
+        changes = []  # (event sport_key, payload)
+        removals = []  # events gone from every feed; never de-duplicated against the per-sport feeds
+        if isinstance(events, list):
+            new_quotes = self.quote_map(events)
+            old_quotes = self._quotes.get(feed_key)
+            self._quotes[feed_key] = {k: v[0] for k, v in new_quotes.items()}
+            old_events = self._events.get(feed_key, {})
+            self._events[feed_key] = {k[0]: rec.sport_key for k, (_, rec) in new_quotes.items()}
+            if old_quotes is None:
+                # First load of this feed: subscribers that connected earlier got an empty snapshot of it
+                self._resync_subscribers(feed_key)
+            else:
+                for (eid, book, outcome), (price, rec) in new_quotes.items():
+                    prev = old_quotes.get((eid, book, outcome))
+                    if prev != price:
+                        changes.append((rec.sport_key, {
+                            "type": "price", "event_id": eid, "match": f"{rec.home_team} vs {rec.away_team}",
+                            "book": book, "outcome": outcome, "price": price, "previous": prev,
+                        }))
+                # An event leaving one feed (e.g. rolling off "upcoming") may still be listed in another
+                for eid in set(old_events) - set(self._events[feed_key]):
+                    if not any(eid in listed for listed in self._events.values()):
+                        removals.append((old_events[eid], {"type": "removed", "event_id": eid}))
+        if isinstance(scores, list):
+            new_scores = {}
+            sport_of = {}
+            for ev in scores:
+                home_s, away_s = _score_pair(ev)
+                if ev.get("id") and home_s is not None and away_s is not None:
+                    new_scores[ev["id"]] = (home_s, away_s, bool(ev.get("completed")))
+                    sport_of[ev["id"]] = ev.get("sport_key")
+            old_scores = self._scores.get(feed_key, {})
+            self._scores[feed_key] = new_scores
+            for eid, (home_s, away_s, completed) in new_scores.items():
+                if old_scores.get(eid) != (home_s, away_s, completed):
+                    changes.append((sport_of[eid], {
+                        "type": "score", "event_id": eid,
+                        "score": f"{home_s}-{away_s}", "completed": completed,
+                    }))
+        # The upcoming feed overlaps the per-sport feeds; only relay its events for sports without a feed
+        if feed_key == "upcoming":
+            own_feeds = set(SPORT_KEY_MAP.values())
+            changes = [(sk, c) for sk, c in changes if sk not in own_feeds]
+        changes += removals
+        if changes:
+            self._broadcast(feed_key, changes)
+
+    def _broadcast(self, feed_key: str, changes: list):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for q, sport_keys in subscribers:
+            items = [c for sk, c in changes if sport_keys is None or sk in sport_keys]
+            if not items:
+                continue
+            try:
+                q.put_nowait({"feed": feed_key, "version": _odds_snapshot.version, "changes": items})
+            except queue.Full:
+                self._resync(q)
+
+    def _resync_subscribers(self, feed_key: str):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for q, sport_keys in subscribers:
+            if sport_keys is None or feed_key == "upcoming" or feed_key in sport_keys:
+                self._resync(q)
+
+    @staticmethod
+    def _resync(q):
+        """Deltas are incremental, so a slow client that missed one can't catch up from the next:
+        drop its backlog and queue a marker (None) that makes the stream send a fresh snapshot."""
+        try:
+            while True:
+                q.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            q.put_nowait(None)
+        except queue.Full:
+            pass
+
+
+_odds_stream = OddsStream(ODDS_STREAM_MAX_SUBSCRIBERS)
+
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+# ============================================================================
+# END LIVE ODDS STREAM
+# ============================================================================
+
+
+_odds_snapshot = OddsSnapshot(_odds_scheduler)
+
+
+def ensure_odds_snapshot_started():
+    """Start the background refresher (once per worker process) when the Odds API is configured."""
+    if ODDS_SNAPSHOT_ENABLED and ODDS_API_KEY and ODDS_API_KEY != "YOUR_ODDS_API_KEY_HERE":
+        _odds_snapshot.start()
+
+
+def current_odds(sport_key: str, markets: Optional[list] = None):
+    """Odds for sport_key from the background snapshot; falls back to a (cached) fetch until the
+    snapshot has loaded that sport."""
+    data = _odds_snapshot.odds(sport_key, markets)
+    if data is None:
+        data = fetch_odds_data(sport_key, markets=markets)
+    return data
+
+
+def current_scores(sport_key: str = "upcoming") -> list:
+    """Scores for sport_key from the background snapshot, falling back to a (cached) fetch."""
+    data = _odds_snapshot.scores(sport_key)
+    if data is None:
+        data = fetch_scores(sport_key, days_from=1)
+    return data or []
+
+
+class UpcomingIndex:
+    """The 'upcoming' feed parsed once and shared by every caller: events per sport_key (in commence
+    order) and by event id, so per-sport lookups no longer re-scan the whole feed."""
+
+    __slots__ = ("source", "by_sport", "by_id")
+
+    def __init__(self, events: list):
+        self.source = events
+        self.by_sport = {}
+        self.by_id = {}
+        for e in sorted(events, key=lambda e: e.get("commence_time") or ""):
+            self.by_sport.setdefault(e.get("sport_key") or "other", []).append(e)
+            if e.get("id"):
+                self.by_id[e["id"]] = e
+
+    def for_sport(self, sport_key: str) -> list:
+        return self.by_sport.get(sport_key, [])
+
+    def matching_sports(self, fragment: str) -> list:
+        """Events of every sport whose key contains fragment (e.g. 'olympics')."""
+        out = []
+        for sk, events in self.by_sport.items():
+            if fragment in sk.lower():
+                out.extend(events)
+        return out
+
+
+_upcoming_index = UpcomingIndex([])
+_upcoming_index_lock = threading.Lock()
+
+
+def upcoming_index() -> UpcomingIndex:
+    """Index over the current 'upcoming' feed; rebuilt only when the snapshot/cache hands out a new list."""
+    global _upcoming_index
+    data = current_odds("upcoming")
+    if not isinstance(data, list):
+        return UpcomingIndex([])
+    with _upcoming_index_lock:
+        if _upcoming_index.source is not data:
+            _upcoming_index = UpcomingIndex(data)
+        return _upcoming_index
 
 
 # ============================================================================
@@ -276,77 +1418,160 @@ def fetch_all_sports():
 
 THESPORTSDB_API_URL = "https://www.thesportsdb.com/api/v1/json/3"  # Free tier (key=3)
 
+# Persistent cache of TheSportsDB responses (survives restarts); TTL in seconds per lookup kind
+SPORTSDB_CACHE_ENABLED = os.getenv("SPORTSDB_CACHE_ENABLED", "true").strip().lower() == "true"
+SPORTSDB_CACHE_FILE = DATA_DIR / "sportsdb_cache.sqlite3"
+SPORTSDB_CACHE_TTLS = {
+    "team": int(os.getenv("SPORTSDB_TTL_TEAM", "604800") or "604800"),  # team metadata: 7 days
+    "standings": int(os.getenv("SPORTSDB_TTL_STANDINGS", "21600") or "21600"),  # 6 hours
+    "form": int(os.getenv("SPORTSDB_TTL_FORM", "3600") or "3600"),  # last results: 1 hour
+    "player": int(os.getenv("SPORTSDB_TTL_PLAYER", "259200") or "259200"),  # 3 days
+}
+# "Not found" answers (empty result lists) are remembered too, for a shorter time
+SPORTSDB_NEGATIVE_TTL = int(os.getenv("SPORTSDB_NEGATIVE_TTL", "21600") or "21600")
+
+
+class SportsDbCache:
+    """Key-value cache in SQLite under DATA_DIR: key -> JSON payload with an expiry. Empty payloads
+    (not found) are stored as negative entries. Any SQLite failure disables the cache instead of
+    failing the lookup."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = None
+        self._disabled = not SPORTSDB_CACHE_ENABLED
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+
+    def _db(self):
+        if self._conn is None and not self._disabled:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=5)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS cache ("
+                    "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL, negative INTEGER NOT NULL)"
+                )
+                conn.execute("DELETE FROM cache WHERE expires < ?", (time.time(),))
+                conn.commit()
+                self._conn = conn
+            except sqlite3.Error as e:
+                print(f"[sportsdb-cache] disabled: {e!r}", flush=True)
+                self._disabled = True
+        return self._conn
+
+    def get(self, key: str):
+        """(True, payload) on a fresh entry (payload may be a negative entry's empty list), else (False, None)."""
+        with self._lock:
+            db = self._db()
+            if db is None:
+                return False, None
+            try:
+                row = db.execute("SELECT value, expires, negative FROM cache WHERE key = ?", (key,)).fetchone()
+            except sqlite3.Error as e:
+                print(f"[sportsdb-cache] read failed: {e!r}", flush=True)
+                return False, None
+            if row is None or row[1] < time.time():
+                self.misses += 1
+                return False, None
+            if row[2]:
+                self.negative_hits += 1
+            else:
+                self.hits += 1
+            return True, json.loads(row[0])
+
+    def put(self, key: str, payload, ttl: int, negative: bool):
+        with self._lock:
+            db = self._db()
+            if db is None:
+                return
+            try:
+                db.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, expires, negative) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(payload), time.time() + ttl, int(negative)),
+                )
+                db.commit()
+            except sqlite3.Error as e:
+                print(f"[sportsdb-cache] write failed: {e!r}", flush=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            db = self._db()
+            rows = 0
+            if db is not None:
+                try:
+                    rows = db.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+                except sqlite3.Error:
+                    pass
+            return {
+                "enabled": db is not None,
+                "rows": rows,
+                "hits": self.hits,
+                "negative_hits": self.negative_hits,
+                "misses": self.misses,
+            }
+
+
+_sportsdb_cache = SportsDbCache(SPORTSDB_CACHE_FILE)
+
+
+def _sportsdb_lookup(kind: str, path: str, params: dict, list_key: str) -> Optional[list]:
+    """data[list_key] of a TheSportsDB call, through the persistent cache. [] means not found
+    (cached as a negative entry); None means the request failed (not cached)."""
+    key = path + "?" + "&".join(f"{k}={str(v).strip().casefold()}" for k, v in sorted(params.items()))
+    hit, payload = _sportsdb_cache.get(key)
+    if hit:
+        return payload
+    try:
+        r = http_get(f"{THESPORTSDB_API_URL}/{path}", "thesportsdb", params=params)
+        if r.status_code != 200:
+            return None
+        payload = (r.json() or {}).get(list_key) or []
+    except Exception as e:
+        print(f"TheSportsDB {kind} error: {e}", flush=True)
+        return None
+    if payload:
+        _sportsdb_cache.put(key, payload, SPORTSDB_CACHE_TTLS[kind], negative=False)
+    else:
+        _sportsdb_cache.put(key, [], SPORTSDB_NEGATIVE_TTL, negative=True)
+    return payload
+
 
+@request_memoized
+@coalesced
 def fetch_team_details(team_name: str, sport: str = "Soccer") -> dict:
     """Fetch team details from TheSportsDB (free tier, no key required)."""
-    try:
-        r = requests.get(
-            f"{THESPORTSDB_API_URL}/searchteams.php",
-            params={"t": team_name},
-            timeout=10
-        )
-        if r.status_code == 200:
-            data = r.json()
-            teams = data.get("teams", [])
-            if teams:
-                return teams[0]
-    except Exception as e:
-        print(f"TheSportsDB team error: {e}", flush=True)
-    return {}
+    teams = _sportsdb_lookup("team", "searchteams.php", {"t": team_name}, "teams")
+    return teams[0] if teams else {}
 
 
+@request_memoized
+@coalesced
 def fetch_league_table(league_id: str, season: str = "2025-2026") -> list:
     """Fetch league standings from TheSportsDB."""
-    try:
-        r = requests.get(
-            f"{THESPORTSDB_API_URL}/lookuptable.php",
-            params={"l": league_id, "s": season},
-            timeout=10
-        )
-        if r.status_code == 200:
-            data = r.json()
-            return data.get("table", [])
-    except Exception as e:
-        print(f"TheSportsDB standings error: {e}", flush=True)
-    return []
+    return _sportsdb_lookup("standings", "lookuptable.php", {"l": league_id, "s": season}, "table") or []
 
 
+@request_memoized
+@coalesced
 def fetch_recent_form(team_id: str, last_n: int = 5) -> list:
     """Fetch recent results for a team."""
-    try:
-        r = requests.get(
-            f"{THESPORTSDB_API_URL}/eventslast.php",
-            params={"id": team_id},
-            timeout=10
-        )
-        if r.status_code == 200:
-            data = r.json()
-            events = data.get("results", [])
-            return events[:last_n]
-    except Exception as e:
-        print(f"TheSportsDB form error: {e}", flush=True)
-    return []
+    events = _sportsdb_lookup("form", "eventslast.php", {"id": team_id}, "results") or []
+    return events[:last_n]
 
 
+@request_memoized
+@coalesced
 def fetch_player_stats(player_name: str, team: str = None) -> dict:
     """Fetch player statistics from TheSportsDB."""
-    try:
-        params = {"p": player_name}
-        if team:
-            params["t"] = team
-        r = requests.get(
-            f"{THESPORTSDB_API_URL}/searchplayers.php",
-            params=params,
-            timeout=10
-        )
-        if r.status_code == 200:
-            data = r.json()
-            players = data.get("player", [])
-            if players:
-                return players[0]
-    except Exception as e:
-        print(f"TheSportsDB player error: {e}", flush=True)
-    return {}
+    params = {"p": player_name}
+    if team:
+        params["t"] = team
+    players = _sportsdb_lookup("player", "searchplayers.php", params, "player")
+    return players[0] if players else {}
 
 
 def format_player_stats_for_llm(player_data: dict) -> str:
@@ -379,6 +1604,339 @@ def format_player_stats_for_llm(player_data: dict) -> str:
 # ============================================================================
 
 
+# ============================================================================
+# COMPACT ODDS MODEL (feed parsed once into slotted records + NumPy price arrays)
+# ============================================================================
+
+class EventRecord:
+    """One event of an odds feed. outcomes: h2h outcome names (column order of the price arrays);
+    books: bookmaker columns that quote this event, in feed order."""
+
+    __slots__ = ("id", "sport_key", "home_team", "away_team", "home_lc", "away_lc",
+                 "commence_time", "outcomes", "home_col", "away_col", "books")
+
+    def __init__(self, event: dict):
+        self.id = event.get("id")
+        self.sport_key = event.get("sport_key") or "other"
+        self.home_team = event.get("home_team", "")
+        self.away_team = event.get("away_team", "")
+        self.home_lc = self.home_team.lower().strip()
+        self.away_lc = self.away_team.lower().strip()
+        self.commence_time = event.get("commence_time", "")
+        self.outcomes = ()
+        self.home_col = -1
+        self.away_col = -1
+        self.books = ()
+
+
+class OddsFrame:
+    """Odds feed as columnar arrays indexed [event, bookmaker, outcome]:
+    h2h (decimal price), spread_point and spread_price; NaN where a book has no quote.
+    has_h2h / has_spreads [event, bookmaker] mark which books list each market at all."""
+
+    __slots__ = ("events", "book_keys", "book_titles", "h2h", "spread_point", "spread_price",
+                 "has_h2h", "has_spreads", "teams")
+
+    def __init__(self, raw_events: list):
+        self.teams = None  # TeamIndex, built on first use (see team_index)
+        events = [e for e in raw_events or [] if isinstance(e, dict)]
+        self.events = [EventRecord(e) for e in events]
+        book_col = {}
+        self.book_keys = []
+        self.book_titles = []
+        max_outcomes = 1
+        # Pass 1: bookmaker columns and per-event outcome columns
+        for rec, e in zip(self.events, events):
+            names = []
+            books = []
+            for b in e.get("bookmakers", []):
+                bkey = b.get("key") or b.get("title", "?")
+                if bkey not in book_col:
+                    book_col[bkey] = len(self.book_keys)
+                    self.book_keys.append(bkey)
+                    self.book_titles.append(b.get("title", "?"))
+                books.append(book_col[bkey])
+                for m in b.get("markets", []):
+                    for o in m.get("outcomes", []):
+                        n = o.get("name", "")
+                        if m.get("key") in ("h2h", "spreads") and n and n not in names:
+                            names.append(n)
+            rec.outcomes = tuple(names)
+            rec.books = tuple(books)
+            lowered = [n.lower().strip() for n in names]
+            rec.home_col = lowered.index(rec.home_lc) if rec.home_lc in lowered else -1
+            rec.away_col = lowered.index(rec.away_lc) if rec.away_lc in lowered else -1
+            max_outcomes = max(max_outcomes, len(names))
+        shape = (len(self.events), len(self.book_keys), max_outcomes)
+        self.h2h = np.full(shape, np.nan)
+        self.spread_point = np.full(shape, np.nan)
+        self.spread_price = np.full(shape, np.nan)
+        self.has_h2h = np.zeros(shape[:2], dtype=bool)
+        self.has_spreads = np.zeros(shape[:2], dtype=bool)
+        # Pass 2: fill prices
+        for i, (rec, e) in enumerate(zip(self.events, events)):
+            col = {n: j for j, n in enumerate(rec.outcomes)}
+            for b, bc in zip(e.get("bookmakers", []), rec.books):
+                for m in b.get("markets", []):
+                    key = m.get("key")
+                    if key == "h2h":
+                        self.has_h2h[i, bc] = True
+                    elif key == "spreads":
+                        self.has_spreads[i, bc] = True
+                    else:
+                        continue
+                    for o in m.get("outcomes", []):
+                        j = col.get(o.get("name", ""))
+                        price = o.get("price")
+                        if j is None or not price:
+                            continue
+                        if key == "h2h":
+                            self.h2h[i, bc, j] = price
+                        elif o.get("point") is not None:
+                            self.spread_point[i, bc, j] = o["point"]
+                            self.spread_price[i, bc, j] = price
+
+    def __len__(self):
+        return len(self.events)
+
+    def h2h_quotes(self, i: int, bc: int) -> list:
+        """[(outcome name, price)] quoted by bookmaker column bc for event i."""
+        row = self.h2h[i, bc]
+        return [(n, float(row[j])) for j, n in enumerate(self.events[i].outcomes) if not np.isnan(row[j])]
+
+    def first_h2h_book(self, i: int, first_only: bool = False) -> Optional[int]:
+        """First bookmaker (feed order) listing h2h for event i; with first_only, only the event's first book counts."""
+        books = self.events[i].books[:1] if first_only else self.events[i].books
+        for bc in books:
+            if self.has_h2h[i, bc]:
+                return bc
+        return None
+
+    def best_h2h(self, i: int) -> list:
+        """[(outcome name, best price, bookmaker title)]; ties go to the book listed first in the feed."""
+        books = list(self.events[i].books)
+        if not books:
+            return []
+        prices = self.h2h[i, books]  # [book (feed order), outcome]
+        out = []
+        for j, name in enumerate(self.events[i].outcomes):
+            col = prices[:, j]
+            if np.all(np.isnan(col)):
+                continue
+            k = int(np.nanargmax(col))
+            out.append((name, float(col[k]), self.book_titles[books[k]]))
+        return out
+
+    def last_quote(self, i: int, col: int) -> Optional[float]:
+        """Price for outcome column col from the last book (feed order) quoting it."""
+        if col < 0:
+            return None
+        for bc in reversed(self.events[i].books):
+            v = self.h2h[i, bc, col]
+            if not np.isnan(v):
+                return float(v)
+        return None
+
+
+_odds_frames = {}  # id(events list) -> (events list, OddsFrame); holds the list so ids stay unique
+_odds_frames_lock = threading.Lock()
+ODDS_FRAME_CACHE_SIZE = 64
+
+
+def odds_frame(events) -> OddsFrame:
+    """OddsFrame for an events list, parsed once per list object (snapshot/cache/index lists are reused)."""
+    if not isinstance(events, list):
+        return OddsFrame([])
+    with _odds_frames_lock:
+        hit = _odds_frames.get(id(events))
+        if hit is not None and hit[0] is events:
+            return hit[1]
+    frame = OddsFrame(events)
+    with _odds_frames_lock:
+        if len(_odds_frames) >= ODDS_FRAME_CACHE_SIZE:
+            _odds_frames.pop(next(iter(_odds_frames)))
+        _odds_frames[id(events)] = (events, frame)
+    return frame
+
+
+# Nicknames / short forms -> normalized full team name (only used when that team is in the feed)
+TEAM_NICKNAMES = {
+    # NBA
+    "sixers": "philadelphia 76ers", "niners": "san francisco 49ers", "cavs": "cleveland cavaliers",
+    "mavs": "dallas mavericks", "wolves": "minnesota timberwolves", "t wolves": "minnesota timberwolves",
+    "blazers": "portland trail blazers", "dubs": "golden state warriors", "nola": "new orleans pelicans",
+    "okc": "oklahoma city thunder", "clips": "los angeles clippers", "knickerbockers": "new york knicks",
+    # NFL / NHL / MLB
+    "pats": "new england patriots", "bucs": "tampa bay buccaneers", "jags": "jacksonville jaguars",
+    "habs": "montreal canadiens", "leafs": "toronto maple leafs", "caps": "washington capitals",
+    "pens": "pittsburgh penguins", "sox": "boston red sox", "yanks": "new york yankees",
+    # Soccer
+    "man utd": "manchester united", "man united": "manchester united", "man u": "manchester united",
+    "man city": "manchester city", "spurs": "tottenham hotspur", "gunners": "arsenal",
+    "wolves fc": "wolverhampton wanderers", "villa": "aston villa", "newcastle": "newcastle united",
+    "forest": "nottingham forest", "palace": "crystal palace", "barca": "barcelona",
+    "psg": "paris saint germain", "inter": "inter milan", "juve": "juventus", "bayern": "bayern munich",
+}
+# NBA tricodes not already produced by a name's initials (e.g. LAL, NYK, GSW come for free)
+TEAM_ABBREVIATIONS = {
+    "atl": "atlanta hawks", "bos": "boston celtics", "bkn": "brooklyn nets", "cha": "charlotte hornets",
+    "chi": "chicago bulls", "cle": "cleveland cavaliers", "dal": "dallas mavericks", "den": "denver nuggets",
+    "det": "detroit pistons", "gs": "golden state warriors", "hou": "houston rockets", "ind": "indiana pacers",
+    "mem": "memphis grizzlies", "mia": "miami heat", "mil": "milwaukee bucks", "min": "minnesota timberwolves",
+    "nop": "new orleans pelicans", "ny": "new york knicks", "orl": "orlando magic", "phi": "philadelphia 76ers",
+    "phx": "phoenix suns", "por": "portland trail blazers", "sac": "sacramento kings",
+    "sas": "san antonio spurs", "tor": "toronto raptors", "uta": "utah jazz", "was": "washington wizards",
+}
+# Words too common across team names to identify one on their own
+_TEAM_GENERIC_WORDS = frozenset((
+    "fc", "afc", "cf", "sc", "ac", "club", "city", "united", "real", "state", "the", "and", "of", "de",
+    "new", "san", "los", "las", "st", "saint", "north", "south", "west", "east",
+))
+# Chat filler that should never be fuzzy-matched to a team
+_TEAM_QUERY_STOPWORDS = frozenset((
+    "who", "will", "win", "wins", "winning", "bet", "on", "should", "i", "predict", "tonight", "today",
+    "game", "match", "the", "vs", "versus", "and", "or", "please", "odds", "analysis", "analyze", "give",
+    "me", "an", "a", "for", "in", "depth", "breakdown", "between", "is", "better", "was", "were", "what",
+    "about", "than", "more", "ever", "even", "over", "under", "min", "mins", "minutes",
+))
+
+
+def _norm_team(text: str) -> str:
+    """Lowercase, accent-free, punctuation-free, single-spaced team text."""
+    text = unicodedata.normalize("NFKD", text or "").encode("ascii", "ignore").decode("ascii").lower()
+    text = re.sub(r"[^a-z0-9]+", " ", text.replace("&", " and "))
+    return " ".join(text.split())
+
+
+def _team_aliases(full: str) -> set:
+    """Aliases derived from a normalized team name: full name, mascot, city, distinctive words, initials."""
+    words = full.split()
+    aliases = {full}
+    if len(words) >= 2:
+        aliases.add(" ".join(words[:-1]))  # city / region ("boston", "los angeles")
+        aliases.add(words[-1])  # mascot ("celtics")
+        if len(words) >= 3:
+            aliases.add(" ".join(words[-2:]))  # two-word mascots ("trail blazers", "maple leafs")
+            aliases.add(" ".join(words[1:]))
+    aliases.update(w for w in words if len(w) >= 3 and w not in _TEAM_GENERIC_WORDS)
+    return {a for a in aliases if a and a not in _TEAM_GENERIC_WORDS}
+
+
+def _team_initials(full: str) -> Optional[str]:
+    """Initials of a normalized team name with 3+ words ("lal", "gsw", "nyk"), else None."""
+    words = full.split()
+    return "".join(w[0] for w in words) if len(words) >= 3 else None
+
+
+class TeamIndex:
+    """Alias -> team lookup for one OddsFrame: normalized names, mascots, cities and nicknames hash straight
+    to the teams (and so the events) they name. Abbreviations and initials ("was", "min", "lal") double as
+    English words, so they only count when they are the whole text or written in capitals ("LAL"), and
+    only after every name alias has been tried. Unknown text falls back to prefix and difflib fuzzy
+    matching over the name aliases."""
+
+    __slots__ = ("aliases", "abbreviations", "events_by_team", "_keys", "_resolved")
+
+    def __init__(self, frame: "OddsFrame"):
+        self.aliases = {}  # alias -> set of normalized team names
+        self.abbreviations = {}  # abbreviation / initials -> set of normalized team names
+        self.events_by_team = {}  # normalized team name -> [event index, ...] in feed order
+        for i, rec in enumerate(frame.events):
+            for name in (rec.home_team, rec.away_team):
+                full = _norm_team(name)
+                if not full:
+                    continue
+                self.events_by_team.setdefault(full, []).append(i)
+        for full in self.events_by_team:
+            for alias in _team_aliases(full):
+                self.aliases.setdefault(alias, set()).add(full)
+            initials = _team_initials(full)
+            if initials:
+                self.abbreviations.setdefault(initials, set()).add(full)
+        for alias, full in TEAM_NICKNAMES.items():
+            if full in self.events_by_team:
+                self.aliases.setdefault(alias, set()).add(full)
+        for abbr, full in TEAM_ABBREVIATIONS.items():
+            if full in self.events_by_team:
+                self.abbreviations.setdefault(abbr, set()).add(full)
+        self._keys = sorted(self.aliases)
+        self._resolved = {}
+
+    def resolve(self, text: str) -> set:
+        """Teams named by free text ("sixers", "man utd", "who will win lakers", "LAL"); empty set if none."""
+        q = _norm_team(text)
+        capitals = frozenset(w.lower() for w in re.findall(r"\b[A-Z]{2,4}\b", text or ""))
+        hit = self._resolved.get((q, capitals))
+        if hit is None:
+            hit = self._resolve(q, capitals)
+            if len(self._resolved) < 1024:
+                self._resolved[(q, capitals)] = hit
+        return hit
+
+    def _resolve(self, q: str, capitals: frozenset = frozenset()) -> set:
+        if not q:
+            return set()
+        if q in self.aliases:
+            return self.aliases[q]
+        if q in self.abbreviations:  # the whole side is an abbreviation ("gsw", "ny")
+            return self.abbreviations[q]
+        words = q.split()
+        # Longest word run that is a known alias ("who will win boston celtics" -> "boston celtics")
+        for n in range(min(len(words), 4), 0, -1):
+            for start in range(len(words) - n + 1):
+                gram = " ".join(words[start:start + n])
+                if gram in self.aliases and gram not in _TEAM_QUERY_STOPWORDS:
+                    return self.aliases[gram]
+        for w in words:
+            if w in capitals and w in self.abbreviations:  # "who wins LAL vs BOS"
+                return self.abbreviations[w]
+        # Three-letter prefixes are mostly ordinary words ("was", "min", "ind"); abbreviations cover those
+        candidates = [w for w in words if len(w) >= 4 and w not in _TEAM_QUERY_STOPWORDS]
+        for w in candidates:
+            # Truncated names ("celt", "phila")
+            found = set()
+            for key in self._keys:
+                if key.startswith(w):
+                    found |= self.aliases[key]
+            if found:
+                return found
+        for w in candidates:
+            close = difflib.get_close_matches(w, self._keys, n=1, cutoff=0.8)  # typos ("celitcs")
+            if close:
+                return self.aliases[close[0]]
+        return set()
+
+    def events_for(self, teams: set) -> set:
+        return {i for full in teams for i in self.events_by_team.get(full, ())}
+
+    def matchups(self, frame: "OddsFrame", text1: str, text2: str) -> list:
+        """Event indices (feed order) where text1 names one side and text2 the other."""
+        teams1, teams2 = self.resolve(text1), self.resolve(text2)
+        found = []
+        for i in sorted(self.events_for(teams1) & self.events_for(teams2)):
+            rec = frame.events[i]
+            home, away = _norm_team(rec.home_team), _norm_team(rec.away_team)
+            if (home in teams1 and away in teams2) or (home in teams2 and away in teams1):
+                found.append(i)
+        return found
+
+    def involving(self, text1: str, text2: str) -> list:
+        """Event indices (feed order) involving a team named by either text."""
+        return sorted(self.events_for(self.resolve(text1)) | self.events_for(self.resolve(text2)))
+
+
+def team_index(frame: "OddsFrame") -> TeamIndex:
+    """Alias index for frame, built once per frame (so once per snapshot refresh)."""
+    if frame.teams is None:
+        frame.teams = TeamIndex(frame)
+    return frame.teams
+
+
+# ============================================================================
+# END COMPACT ODDS MODEL
+# ============================================================================
+
+
 def _implied_prob(decimal_odds: float) -> float:
     """Convert decimal odds to implied probability (0-100)."""
     if not decimal_odds or decimal_odds <= 0:
@@ -386,44 +1944,33 @@ def _implied_prob(decimal_odds: float) -> float:
     return 100.0 / float(decimal_odds)
 
 
-def _build_game_analysis(game: dict) -> str:
+def _build_game_analysis(frame: OddsFrame, i: int) -> str:
     """Build in-depth analysis block for one game: odds by book, implied prob, best odds, spreads if present."""
-    home = game.get("home_team", "Home")
-    away = game.get("away_team", "Away")
+    rec = frame.events[i]
+    home = rec.home_team or "Home"
+    away = rec.away_team or "Away"
     lines = [f"## {home} vs {away}", ""]
-    best_h2h = {}  # outcome name -> (best decimal, bookmaker name)
-    book_lines = []
-    for b in game.get("bookmakers", []):
-        book_name = b.get("title", "?")
-        for m in b.get("markets", []):
-            if m.get("key") == "h2h":
-                parts = [f"**{book_name}** (moneyline):"]
-                for o in m.get("outcomes", []):
-                    name = o.get("name", "")
-                    price = o.get("price")
-                    if name and price:
-                        imp = _implied_prob(price)
-                        parts.append(f"  {name}: {price} (implied {imp:.1f}%)")
-                        if name not in best_h2h or price > best_h2h[name][0]:
-                            best_h2h[name] = (price, book_name)
-                book_lines.append(" ".join(parts))
-            elif m.get("key") == "spreads":
-                parts = [f"**{book_name}** (spread):"]
-                for o in m.get("outcomes", []):
-                    name = o.get("name", "")
-                    point = o.get("point")
-                    price = o.get("price")
-                    if name and point is not None and price:
-                        parts.append(f"  {name} {point:+.1f} @ {price}")
-                book_lines.append(" ".join(parts))
-    lines.extend(book_lines)
+    for bc in rec.books:
+        book_name = frame.book_titles[bc]
+        if frame.has_h2h[i, bc]:
+            parts = [f"**{book_name}** (moneyline):"]
+            for name, price in frame.h2h_quotes(i, bc):
+                parts.append(f"  {name}: {price} (implied {_implied_prob(price):.1f}%)")
+            lines.append(" ".join(parts))
+        if frame.has_spreads[i, bc]:
+            parts = [f"**{book_name}** (spread):"]
+            points, prices = frame.spread_point[i, bc], frame.spread_price[i, bc]
+            for j, name in enumerate(rec.outcomes):
+                if not np.isnan(points[j]):
+                    parts.append(f"  {name} {points[j]:+.1f} @ {float(prices[j])}")
+            lines.append(" ".join(parts))
+    best_h2h = frame.best_h2h(i)
     if best_h2h:
         lines.append("")
         lines.append("**Best odds by outcome:**")
-        for name, (price, book) in best_h2h.items():
-            imp = _implied_prob(price)
-            lines.append(f"  {name}: {price} at {book} (implied {imp:.1f}%)")
-        total_impl = sum(_implied_prob(best_h2h[n][0]) for n in best_h2h)
+        for name, price, book in best_h2h:
+            lines.append(f"  {name}: {price} at {book} (implied {_implied_prob(price):.1f}%)")
+        total_impl = sum(_implied_prob(price) for _, price, _ in best_h2h)
         lines.append(f"  (Combined best-odds implied total: {total_impl:.1f}%; below 100% = potential value.)")
     return "\n".join(lines)
 
@@ -432,25 +1979,21 @@ def build_analysis_context(message: str, sport: str) -> str:
     """Build rich context for in-depth betting analysis: multiple books, implied prob, best odds, spreads."""
     msg = message.lower().strip()
     api_key = SPORT_KEY_MAP.get(sport, SPORT_KEY_MAP["basketball"])
-    odds = fetch_odds_data(api_key, markets=["h2h", "spreads"])
+    odds = current_odds(api_key, markets=["h2h", "spreads"])
     if isinstance(odds, dict) and "error" in odds:
         return f"(Could not load odds for analysis: {odds['error']})"
-    games = odds or []
+    frame = odds_frame(odds or [])
     # If user mentioned two teams, try to find that matchup
     if "vs" in msg:
-        parts = msg.split("vs", 1)
+        # Split the original text so capitalised abbreviations ("LAL vs BOS") still read as teams
+        parts = re.split("vs", message.strip(), maxsplit=1, flags=re.IGNORECASE)
         if len(parts) == 2:
-            t1 = parts[0].strip().lower()
-            t2 = parts[1].strip().lower()
-            for g in games:
-                home = g.get("home_team", "").lower()
-                away = g.get("away_team", "").lower()
-                if (t1 in home and t2 in away) or (t2 in home and t1 in away) or (t1 in away and t2 in home):
-                    return "In-depth odds data for your analysis (use implied %, best odds, and spreads to suggest value and possible bets):\n\n" + _build_game_analysis(g)
+            t1 = parts[0].strip()
+            t2 = parts[1].strip()
+            for i in team_index(frame).matchups(frame, t1, t2)[:1]:
+                return "In-depth odds data for your analysis (use implied %, best odds, and spreads to suggest value and possible bets):\n\n" + _build_game_analysis(frame, i)
     # Otherwise analyze first 2 upcoming games
-    blocks = []
-    for g in games[:2]:
-        blocks.append(_build_game_analysis(g))
+    blocks = [_build_game_analysis(frame, i) for i in range(min(2, len(frame)))]
     if not blocks:
         return "(No upcoming games with odds for this sport.)"
     return "In-depth odds data for your analysis (use implied %, best odds, and spreads to suggest value and possible bets):\n\n" + "\n\n---\n\n".join(blocks)
@@ -459,43 +2002,149 @@ def build_analysis_context(message: str, sport: str) -> str:
 def predict_outcome(team1, team2, odds_data):
     if isinstance(odds_data, dict) and "error" in odds_data:
         return f"⚠️ Error fetching odds: {odds_data['error']}"
-    team1, team2 = team1.lower().strip(), team2.lower().strip()
-    for game in odds_data or []:
-        home_team = game.get("home_team", "").lower().strip()
-        away_team = game.get("away_team", "").lower().strip()
-        if (team1 in home_team or team2 in away_team) and (team2 in away_team or team1 in home_team):
-            home_odds = away_odds = None
-            for b in game.get("bookmakers", []):
-                for m in b.get("markets", []):
-                    if m.get("key") != "h2h":
-                        continue
-                    for o in m.get("outcomes", []):
-                        n = o.get("name", "").lower().strip()
-                        if n == home_team:
-                            home_odds = o.get("price")
-                        elif n == away_team:
-                            away_odds = o.get("price")
-            if home_odds and away_odds:
-                winner = game["home_team"] if home_odds < away_odds else game["away_team"]
-                return f"🏆 **{winner}** is the favorite. Odds — {game['home_team']}: {home_odds}, {game['away_team']}: {away_odds}"
-        if (team2 in home_team or team1 in away_team) and (team1 in away_team or team2 in home_team):
-            home_odds = away_odds = None
-            for b in game.get("bookmakers", []):
-                for m in b.get("markets", []):
-                    if m.get("key") != "h2h":
-                        continue
-                    for o in m.get("outcomes", []):
-                        n = o.get("name", "").lower().strip()
-                        if n == home_team:
-                            home_odds = o.get("price")
-                        elif n == away_team:
-                            away_odds = o.get("price")
-            if home_odds and away_odds:
-                winner = game["home_team"] if home_odds < away_odds else game["away_team"]
-                return f"🏆 **{winner}** is the favorite. Odds — {game['home_team']}: {home_odds}, {game['away_team']}: {away_odds}"
+    frame = odds_frame(odds_data or [])
+    teams = team_index(frame)
+    # The exact pairing first, then any game involving either team (either orientation)
+    exact = teams.matchups(frame, team1, team2)
+    for i in exact + [i for i in teams.involving(team1, team2) if i not in exact]:
+        rec = frame.events[i]
+        home_odds = frame.last_quote(i, rec.home_col)
+        away_odds = frame.last_quote(i, rec.away_col)
+        if home_odds and away_odds:
+            winner = rec.home_team if home_odds < away_odds else rec.away_team
+            return f"🏆 **{winner}** is the favorite. Odds — {rec.home_team}: {home_odds}, {rec.away_team}: {away_odds}"
     return f"⚠️ No odds found for that matchup. Try exact team names (e.g. 'Lakers' vs 'Celtics') or ask for current matchups."
 
 
+# ============================================================================
+# VALUE SCAN (vectorized arbitrage / overround / best-line scan over every sport)
+# ============================================================================
+
+_scan_frame = (None, None, None)  # (lists key, source lists, OddsFrame)
+_scan_frame_lock = threading.Lock()
+
+
+def _scan_universe(sport_keys: list) -> OddsFrame:
+    """One OddsFrame over the current odds of every given sport (deduplicated by event id);
+    rebuilt only when one of the underlying snapshot lists changes."""
+    global _scan_frame
+    lists = [current_odds(k) for k in sport_keys]
+    lists = [l for l in lists if isinstance(l, list)]
+    key = tuple(id(l) for l in lists)
+    with _scan_frame_lock:
+        cached_key, cached_lists, frame = _scan_frame
+        if cached_key == key and all(a is b for a, b in zip(cached_lists, lists)):
+            return frame
+    seen = set()
+    events = []
+    for l in lists:
+        for e in l:
+            eid = e.get("id")
+            if eid in seen:
+                continue
+            seen.add(eid)
+            events.append(e)
+    frame = OddsFrame(events)
+    with _scan_frame_lock:
+        _scan_frame = (key, lists, frame)
+    return frame
+
+
+def scan_value(frame: OddsFrame, limit: int = 20) -> dict:
+    """Rank arbitrage (sum of best implied < 100%), bookmaker overround and best-line edges
+    for every event x bookmaker x outcome in frame, in a handful of array operations."""
+    E, B, O = frame.h2h.shape
+    if not E or not B:
+        return {"events_scanned": 0, "quotes": 0, "arbitrage": [], "best_lines": [], "overround_by_book": []}
+    prices = frame.h2h
+    quoted = ~np.isnan(prices)  # [E, B, O]
+    implied = np.where(quoted, 1.0 / np.where(quoted, prices, 1.0), np.nan)
+    outcome_quoted = quoted.any(axis=1)  # [E, O]
+    n_outcomes = outcome_quoted.sum(axis=1)  # [E]
+    # A book's line is complete when it quotes every outcome quoted anywhere for that event
+    complete = (quoted.sum(axis=2) == n_outcomes[:, None]) & (n_outcomes[:, None] >= 2)  # [E, B]
+
+    # Best price per outcome and the book offering it (first book wins ties)
+    best_price = np.fmax.reduce(prices, axis=1)  # [E, O]
+    best_book = np.argmax(np.where(quoted, prices, -np.inf), axis=1)  # [E, O]
+    best_implied_total = np.where(outcome_quoted, 1.0 / np.where(outcome_quoted, best_price, 1.0), 0.0).sum(axis=1)
+    is_arb = (n_outcomes >= 2) & (best_implied_total < 1.0)
+
+    # Per-book overround (margin) on complete lines
+    book_overround = np.where(complete, np.nansum(implied, axis=2), np.nan)  # [E, B]
+    lines_per_book = complete.sum(axis=0)
+    margin_by_book = np.where(lines_per_book > 0, np.nansum(book_overround - 1.0, axis=0) / np.maximum(lines_per_book, 1), np.nan)
+
+    # Consensus fair probability: mean implied across complete books, normalized to remove the margin
+    consensus = np.where(complete[:, :, None], implied, np.nan)
+    n_complete = complete.sum(axis=1)  # [E]
+    consensus_mean = np.nansum(consensus, axis=1) / np.maximum(n_complete, 1)[:, None]  # [E, O]
+    consensus_total = consensus_mean.sum(axis=1, keepdims=True)
+    fair = np.where((n_complete[:, None] > 0) & outcome_quoted, consensus_mean / np.where(consensus_total > 0, consensus_total, 1.0), np.nan)
+    edge = best_price * fair - 1.0  # expected return of the best line at the fair probability
+    edge = np.where(np.isnan(edge), -np.inf, edge)
+
+    def event_info(i):
+        rec = frame.events[i]
+        return {
+            "sport": SPORT_TITLES.get(rec.sport_key, rec.sport_key),
+            "event_id": rec.id,
+            "match": f"{rec.home_team} vs {rec.away_team}",
+            "commence": rec.commence_time,
+        }
+
+    arbitrage = []
+    for i in np.argsort(best_implied_total + np.where(is_arb, 0.0, np.inf))[:limit]:
+        if not is_arb[i]:
+            break
+        total = float(best_implied_total[i])
+        legs = []
+        for j in np.flatnonzero(outcome_quoted[i]):
+            price = float(best_price[i, j])
+            legs.append({
+                "outcome": frame.events[i].outcomes[j],
+                "price": price,
+                "book": frame.book_titles[int(best_book[i, j])],
+                "stake_pct": round(100.0 / price / total, 2),  # share of bankroll for an equal payout
+            })
+        arbitrage.append({**event_info(i), "implied_total_pct": round(total * 100, 2),
+                          "profit_pct": round((1.0 / total - 1.0) * 100, 2), "legs": legs})
+
+    best_lines = []
+    flat = edge.ravel()
+    top = np.argpartition(-flat, min(limit, flat.size - 1))[:limit] if flat.size > limit else np.arange(flat.size)
+    for idx in top[np.argsort(-flat[top])]:
+        if not np.isfinite(flat[idx]) or flat[idx] <= 0:
+            break
+        i, j = divmod(int(idx), O)
+        best_lines.append({
+            **event_info(i),
+            "outcome": frame.events[i].outcomes[j],
+            "best_price": float(best_price[i, j]),
+            "book": frame.book_titles[int(best_book[i, j])],
+            "fair_prob_pct": round(float(fair[i, j]) * 100, 2),
+            "edge_pct": round(float(flat[idx]) * 100, 2),
+        })
+
+    overround = [
+        {"book": frame.book_titles[b], "avg_margin_pct": round(float(margin_by_book[b]) * 100, 2), "lines": int(lines_per_book[b])}
+        for b in np.argsort(np.where(np.isnan(margin_by_book), np.inf, margin_by_book))
+        if lines_per_book[b] > 0
+    ]
+    return {
+        "events_scanned": E,
+        "quotes": int(quoted.any(axis=2).sum()),
+        "arbitrage": arbitrage,
+        "best_lines": best_lines,
+        "overround_by_book": overround,
+    }
+
+
+# ============================================================================
+# END VALUE SCAN
+# ============================================================================
+
+
 def format_live_upcoming_reply(by_sport):
     """Format live/upcoming odds as a conversational agent reply."""
     if not by_sport:
@@ -520,40 +2169,31 @@ def format_live_upcoming_reply(by_sport):
     return "\n".join(lines).strip()
 
 
+@request_memoized
 def fetch_olympics_odds():
     """Try multiple sources for Olympics odds: olympics_winter_2026, olympics, then upcoming filtered by olympics."""
     for key in ("olympics_winter_2026", "olympics"):
-        data = fetch_odds_data(key)
+        data = current_odds(key)
         if isinstance(data, dict) and "error" in data:
             continue
         if data and len(data) > 0:
             return data
-    # Fallback: upcoming feed filtered for any sport_key containing "olympics"
-    upcoming = fetch_odds_data("upcoming")
-    if isinstance(upcoming, list):
-        olympics_events = [e for e in upcoming if "olympics" in (e.get("sport_key") or "").lower()]
-        if olympics_events:
-            return olympics_events
-    return []
+    # Fallback: upcoming feed, any sport_key containing "olympics"
+    return upcoming_index().matching_sports("olympics")
 
 
 def _format_events_as_matchups(events):
-    """Turn a list of API events (with bookmakers/markets) into matchup lines."""
+    """Turn a list of API events (with bookmakers/markets) into matchup lines (first book quoting h2h)."""
+    frame = odds_frame(events or [])
     lines = []
-    for game in events or []:
-        home = game.get("home_team", "?")
-        away = game.get("away_team", "?")
-        for b in game.get("bookmakers", []):
-            for m in b.get("markets", []):
-                if m.get("key") != "h2h":
-                    continue
-                parts = [f"**{home}** vs **{away}**"]
-                for o in m.get("outcomes", []):
-                    parts.append(f"{o.get('name')}: {o.get('price')}")
-                lines.append(" — ".join(parts))
-                break
-            if lines and lines[-1].startswith(f"**{home}**"):
-                break
+    for i, rec in enumerate(frame.events):
+        bc = frame.first_h2h_book(i)
+        if bc is None:
+            continue
+        parts = [f"**{rec.home_team or '?'}** vs **{rec.away_team or '?'}**"]
+        for name, price in frame.h2h_quotes(i, bc):
+            parts.append(f"{name}: {price}")
+        lines.append(" — ".join(parts))
     return "\n".join(lines) if lines else None
 
 
@@ -569,14 +2209,12 @@ def get_matchups(sport_key=None):
         if not odds:
             return "No matchups available for this sport right now."
     else:
-        odds = fetch_odds_data(api_key)
+        odds = current_odds(api_key)
         # Fallback: when sport-specific API fails or is empty, use upcoming feed filtered by sport
         if (isinstance(odds, dict) and "error" in odds) or not odds or (isinstance(odds, list) and len(odds) == 0):
-            upcoming = fetch_odds_data("upcoming")
-            if isinstance(upcoming, list) and upcoming:
-                filtered = [e for e in upcoming if e.get("sport_key") == api_key]
-                if filtered:
-                    odds = filtered
+            filtered = upcoming_index().for_sport(api_key)
+            if filtered:
+                odds = filtered
         if isinstance(odds, dict) and "error" in odds:
             return f"Could not load odds: {odds['error']}"
     formatted = _format_events_as_matchups(odds if isinstance(odds, list) else [])
@@ -585,6 +2223,171 @@ def get_matchups(sport_key=None):
     return "No matchups available for this sport right now."
 
 
+# ============================================================================
+# ESPN LEAGUE CACHE (League objects built once per season, refreshed in the background)
+# ============================================================================
+
+ESPN_REFRESH_ENABLED = os.getenv("ESPN_REFRESH_ENABLED", "true").strip().lower() == "true"
+# Seconds between background rebuilds of the current season (rosters + free agents)
+ESPN_REFRESH_INTERVAL = int(os.getenv("ESPN_REFRESH_INTERVAL", "900") or "900")
+# Free agents fetched per refresh (one ESPN request); larger requests go to ESPN directly
+ESPN_FREE_AGENT_POOL = int(os.getenv("ESPN_FREE_AGENT_POOL", "300") or "300")
+ESPN_ERROR_BACKOFF = 60  # seconds a failed build is remembered before ESPN is tried again
+
+
+class _EspnSeason:
+    __slots__ = ("league", "free_agents", "built_at", "pool")
+
+    def __init__(self, league, free_agents, built_at):
+        self.league = league
+        self.free_agents = free_agents  # None until first requested (past seasons rarely need them)
+        self.built_at = built_at
+        self.pool = None  # PlayerPool over free agents + rosters, built on first use
+
+
+class EspnLeagueCache:
+    """espn_api League objects keyed by (league_id, year, credentials). A season is built once
+    (several HTTP round-trips) and then read from memory; the background thread rebuilds the
+    current season every ESPN_REFRESH_INTERVAL and swaps it in whole, so readers never see a
+    half-refreshed league. Past seasons are final and never rebuilt."""
+
+    def __init__(self, refresh_interval: int):
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._seasons = {}  # key -> _EspnSeason
+        self._errors = {}  # key -> (exception, time)
+        self._flights = SingleFlight()
+        self._thread = None
+
+    @staticmethod
+    def key(year: int) -> tuple:
+        return (ESPN_LEAGUE_ID, year, ESPN_S2, ESPN_SWID)
+
+    def _build(self, year: int, with_free_agents: bool) -> _EspnSeason:
+        from espn_api.basketball import League
+        league = League(league_id=int(ESPN_LEAGUE_ID), year=year, espn_s2=ESPN_S2, swid=ESPN_SWID)
+        fa = league.free_agents(size=ESPN_FREE_AGENT_POOL) if with_free_agents else None
+        return _EspnSeason(league, fa, time.time())
+
+    def _stale(self, year: int, season: _EspnSeason) -> bool:
+        # Without the background refresher (or if it stalls) the current season is rebuilt on read
+        return year >= ESPN_YEAR and time.time() - season.built_at > 2 * self.refresh_interval
+
+    def season(self, year: int, force: bool = False, with_free_agents: bool = False) -> _EspnSeason:
+        key = self.key(year)
+        with self._lock:
+            season = self._seasons.get(key)
+            error = self._errors.get(key)
+        if season is not None and not force and not self._stale(year, season):
+            return season
+        if error is not None and not force and time.time() - error[1] < ESPN_ERROR_BACKOFF:
+            if season is not None:
+                return season  # stale, but the last refresh failed moments ago: keep serving it
+            raise error[0]
+
+        def build():
+            try:
+                fresh = self._build(year, with_free_agents or (season is not None and season.free_agents is not None))
+            except Exception as e:
+                with self._lock:
+                    self._errors[key] = (e, time.time())
+                if season is not None:
+                    print(f"[ESPN] refresh year={year} failed, keeping previous data: {e!r}", flush=True)
+                    return season
+                raise
+            with self._lock:
+                self._seasons[key] = fresh
+                self._errors.pop(key, None)
+            return fresh
+
+        return self._flights.do(key, build)
+
+    def league(self, year: int):
+        return self.season(year).league
+
+    def free_agents(self, year: int, size: int = 50) -> list:
+        season = self.season(year, with_free_agents=True)
+        if size > ESPN_FREE_AGENT_POOL:
+            return season.league.free_agents(size=size)
+        if season.free_agents is None:
+            season.free_agents = season.league.free_agents(size=ESPN_FREE_AGENT_POOL)
+        # The whole pool is returned as the same list object, so per-list caches (player_pool) hit
+        return season.free_agents if size >= len(season.free_agents) else season.free_agents[:size]
+
+    def player_pool(self, year: int) -> "PlayerPool":
+        season = self.season(year, with_free_agents=True)
+        if season.pool is None:
+            players = list(self.free_agents(year, ESPN_FREE_AGENT_POOL))
+            rostered = [False] * len(players)
+            fantasy_teams = [None] * len(players)
+            for team in getattr(season.league, "teams", None) or []:
+                for p in getattr(team, "roster", None) or []:
+                    players.append(p)
+                    rostered.append(True)
+                    fantasy_teams.append(getattr(team, "team_name", None))
+            season.pool = PlayerPool(players, rostered, fantasy_teams)
+        return season.pool
+
+    def _run(self):
+        while True:
+            try:
+                self.season(ESPN_YEAR, force=True, with_free_agents=True)
+                # Valuation + 9-cat matrices are derived once per refresh, not per question
+                pool = self.player_pool(ESPN_YEAR)
+                pool.categories()
+                pool.name_index()
+            except Exception as e:
+                print(f"[ESPN] background refresh year={ESPN_YEAR} failed: {e!r}", flush=True)
+            time.sleep(self.refresh_interval)
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="espn-refresh", daemon=True)
+        self._thread.start()
+
+    def state(self) -> dict:
+        now = time.time()
+        with self._lock:
+            return {
+                "refreshing": self._thread is not None,
+                "seasons": {
+                    str(key[1]): {
+                        "age_s": round(now - season.built_at),
+                        "free_agents": len(season.free_agents) if season.free_agents is not None else None,
+                    }
+                    for key, season in self._seasons.items()
+                },
+                "errors": {str(key[1]): str(err)[:200] for key, (err, _) in self._errors.items()},
+            }
+
+
+_espn_leagues = EspnLeagueCache(ESPN_REFRESH_INTERVAL)
+
+
+def ensure_espn_refresh_started():
+    """Start the ESPN background refresher (once per worker process) when a league is configured."""
+    if ESPN_REFRESH_ENABLED and ESPN_LEAGUE_ID and ESPN_YEAR:
+        _espn_leagues.start()
+
+
+def _espn_league(year: int):
+    """espn_api League for the configured league (cached; see EspnLeagueCache)."""
+    return _espn_leagues.league(year)
+
+
+def _espn_free_agents(year: int, size: int = 50) -> list:
+    return _espn_leagues.free_agents(year, size)
+
+
+# ============================================================================
+# END ESPN LEAGUE CACHE
+# ============================================================================
+
+
+@request_memoized
+@coalesced
 def fetch_espn_fantasy_basketball():
     """
     Fetch ESPN Fantasy Basketball free agents (and fantasy points) for the configured league.
@@ -607,13 +2410,7 @@ def fetch_espn_fantasy_basketball():
         if year_try < 2019:
             continue
         try:
-            league = League(
-                league_id=int(ESPN_LEAGUE_ID),
-                year=year_try,
-                espn_s2=ESPN_S2,
-                swid=ESPN_SWID,
-            )
-            fa = league.free_agents(size=40)
+            fa = _espn_free_agents(year_try)
             err_msg = None
             break
         except Exception as e:
@@ -650,6 +2447,74 @@ def fetch_espn_fantasy_basketball():
     return "\n".join(lines)
 
 
+# ============================================================================
+# PAST SEASON SNAPSHOTS (finished seasons summarized once, kept under DATA_DIR)
+# ============================================================================
+
+ESPN_SEASONS_DIR = DATA_DIR / "espn_seasons"
+_season_snapshots = {}  # (league_id, year) -> snapshot dict
+_season_snapshots_lock = threading.Lock()
+
+
+def _summarize_season(league) -> dict:
+    """Standings (top 12) and top scorers (top 20 by avg, then total) of a League, as plain lists."""
+    standings = league.standings()
+    all_players = []
+    for t in standings or []:
+        roster = getattr(t, "roster", []) or []
+        for p in roster:
+            avg = getattr(p, "avg_points", None)
+            if avg is not None and avg > 0:
+                all_players.append((getattr(p, "name", "?"), getattr(p, "position", "?"), float(avg), getattr(p, "total_points", None)))
+    all_players.sort(key=lambda x: (x[2], x[3] or 0), reverse=True)
+    return {
+        "standings": [
+            [getattr(t, "team_name", "?"), getattr(t, "wins", 0), getattr(t, "losses", 0)]
+            for t in (standings or [])[:12]
+        ],
+        "top_scorers": [list(p) for p in all_players[:20]],
+    }
+
+
+def espn_season_snapshot(year: int) -> dict:
+    """Summary of a season: memory, else the snapshot file, else built from the League. Finished
+    seasons (before ESPN_YEAR) never change, so they are written to DATA_DIR/espn_seasons once and
+    afterwards cost a file read instead of a League build."""
+    key = (ESPN_LEAGUE_ID, year)
+    with _season_snapshots_lock:
+        snap = _season_snapshots.get(key)
+    if snap is not None:
+        return snap
+    final = bool(ESPN_YEAR) and year < ESPN_YEAR
+    path = ESPN_SEASONS_DIR / f"{ESPN_LEAGUE_ID}_{year}.json"
+    if final and path.exists():
+        try:
+            snap = json.loads(path.read_text())
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"[ESPN] unreadable season snapshot {path.name}: {e!r}", flush=True)
+    if snap is None:
+        snap = _summarize_season(_espn_league(year))
+        if not final:
+            return snap  # season still in progress: rosters change, keep rebuilding from the cached League
+        try:
+            ESPN_SEASONS_DIR.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(snap, separators=(",", ":")))
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"[ESPN] could not save season snapshot {path.name}: {e!r}", flush=True)
+    with _season_snapshots_lock:
+        _season_snapshots[key] = snap
+    return snap
+
+
+# ============================================================================
+# END PAST SEASON SNAPSHOTS
+# ============================================================================
+
+
+@request_memoized
+@coalesced
 def fetch_espn_past_seasons():
     """
     Fetch standings and top scorers for past ESPN Fantasy Basketball seasons.
@@ -670,32 +2535,15 @@ def fetch_espn_past_seasons():
         if year < 2019:
             continue
         try:
-            league = League(
-                league_id=int(ESPN_LEAGUE_ID),
-                year=year,
-                espn_s2=ESPN_S2,
-                swid=ESPN_SWID,
-            )
-            standings = league.standings()
+            snap = espn_season_snapshot(year)
             lines = [f"ESPN Fantasy Basketball — {year} season (general stats):"]
-            if standings:
+            if snap["standings"]:
                 lines.append("Standings:")
-                for i, t in enumerate(standings[:12], 1):
-                    name = getattr(t, "team_name", "?")
-                    w = getattr(t, "wins", 0)
-                    l = getattr(t, "losses", 0)
+                for i, (name, w, l) in enumerate(snap["standings"], 1):
                     lines.append(f"  {i}. {name} ({w}-{l})")
-            all_players = []
-            for t in standings or []:
-                roster = getattr(t, "roster", []) or []
-                for p in roster:
-                    avg = getattr(p, "avg_points", None)
-                    if avg is not None and avg > 0:
-                        all_players.append((getattr(p, "name", "?"), getattr(p, "position", "?"), float(avg), getattr(p, "total_points", None)))
-            all_players.sort(key=lambda x: (x[2], x[3] or 0), reverse=True)
-            if all_players:
+            if snap["top_scorers"]:
                 lines.append("Top scorers (season avg pts, total pts):")
-                for name, pos, avg_pts, total in all_players[:20]:
+                for name, pos, avg_pts, total in snap["top_scorers"]:
                     total_str = f", total {total}" if total is not None else ""
                     lines.append(f"  • {name} ({pos}): {avg_pts:.1f} avg{total_str}")
             out.append("\n".join(lines))
@@ -834,73 +2682,407 @@ def analyze_player_value(player_stats: dict) -> dict:
     return analysis
 
 
-def analyze_fantasy_trending_players(free_agents: list) -> str:
-    """Analyze which free agents are trending up based on recent performance."""
-    if not free_agents:
-        return "No free agents available for trending analysis."
+# ============================================================================
+# FANTASY VALUATION ENGINE (whole player pool scored with NumPy in one pass)
+# ============================================================================
 
-    trending = []
-
-    for player in free_agents[:50]:  # Analyze top 50 free agents
-        # Calculate trend (proj_avg vs avg_points)
-        avg = getattr(player, "avg_points", None)
-        proj_avg = getattr(player, "projected_avg_points", None)
-
-        if avg and proj_avg and avg > 0 and proj_avg > avg * 1.1:  # Projected 10%+ higher
-            trend_pct = ((proj_avg - avg) / avg) * 100
-            name = getattr(player, "name", "?")
-            pos = getattr(player, "position", "?")
-            team = getattr(player, "proTeam", "?")
-            inj = getattr(player, "injuryStatus", None)
-            trending.append({
-                "name": name,
-                "position": pos,
-                "team": team,
-                "avg": avg,
-                "proj_avg": proj_avg,
-                "trend_pct": trend_pct,
-                "injury": inj
-            })
+FANTASY_CATEGORIES = (("pts", "PTS"), ("reb", "REB"), ("ast", "AST"), ("stl", "STL"), ("blk", "BLK"),
+                      ("to", "TO"), ("fg_pct", "FG%"), ("ft_pct", "FT%"), ("3pm", "3PTM"))
+# Recommendation tiers (same rules as analyze_player_value), highest first
+FANTASY_TIERS = (
+    "🔥 MUST ADD - Elite value",
+    "⭐ HIGH PRIORITY - Great upside",
+    "✅ SOLID PICKUP - Good value",
+    "📈 SPECULATIVE - High upside play",
+    "⚠️ WATCH LIST - Monitor closely",
+)
+_INJURY_RISK_LABELS = ("Low", "Medium", "High")
+
+
+def _num(value) -> float:
+    return float(value) if isinstance(value, (int, float)) else 0.0
+
+
+class PlayerPool:
+    """ESPN players as parallel NumPy arrays: avg/projected/total fantasy points, games played and the
+    per-game category averages (cats, with has_cats marking players that report them). value, upside,
+    consistency, injury risk and recommendation tier are computed for every player at once with
+    analyze_player_value's thresholds. rostered marks players on a fantasy team (fantasy_team names it)."""
+
+    def __init__(self, players: list, rostered: Optional[list] = None, fantasy_teams: Optional[list] = None):
+        self.players = list(players)
+        n = len(self.players)
+        self.names, self.positions, self.teams, self.injuries = [], [], [], []
+        avg, proj, total, games = np.zeros(n), np.zeros(n), np.zeros(n), np.zeros(n)
+        cats = np.zeros((n, len(FANTASY_CATEGORIES)))
+        has_cats = np.zeros(n, dtype=bool)
+        for i, p in enumerate(self.players):
+            self.names.append(getattr(p, "name", "Unknown"))
+            self.positions.append(getattr(p, "position", "?"))
+            self.teams.append(getattr(p, "proTeam", "?"))
+            self.injuries.append(getattr(p, "injuryStatus", None))
+            avg[i] = _num(getattr(p, "avg_points", 0))
+            proj[i] = _num(getattr(p, "projected_avg_points", 0))
+            total[i] = _num(getattr(p, "total_points", 0))
+            # First per-period dict carries games played and (maybe) the category averages
+            for period_stats in (getattr(p, "stats", None) or {}).values():
+                if isinstance(period_stats, dict):
+                    games[i] = _num(period_stats.get("gamesPlayed", 0))
+                    if "avg" in period_stats:
+                        row = period_stats["avg"] or {}
+                        cats[i] = [_num(row.get(key, 0)) for _, key in FANTASY_CATEGORIES]
+                        has_cats[i] = True
+                    break
+        self.avg, self.proj, self.total, self.games = avg, proj, total, games
+        self.cats, self.has_cats = cats, has_cats
+        self.rostered = np.array(rostered if rostered is not None else [False] * n, dtype=bool)
+        self.fantasy_teams = list(fantasy_teams) if fantasy_teams is not None else [None] * n
+        self._categories = None
+        self._name_index = None
+        self._score()
+
+    def _score(self):
+        avg, proj, total, games = self.avg, self.proj, self.total, self.games
+        value = np.select([avg > 40, avg > 35, avg > 30, avg > 25, avg > 20, avg > 15],
+                          [95, 85, 75, 65, 50, 35], 20)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            upside_pct = np.where(avg > 0, (proj - avg) / np.where(avg > 0, avg, 1.0) * 100, 0.0)
+            ratio = np.where(avg * games > 0, total / np.where(avg * games > 0, avg * games, 1.0), 0.0)
+        upside = np.select([upside_pct > 20, upside_pct > 15, upside_pct > 10, upside_pct > 5], [95, 85, 70, 50], 30)
+        self.upside = np.where((proj != 0) & (avg > 0), upside, 0)
+        consistency = np.select([(ratio >= 0.95) & (ratio <= 1.05), (ratio >= 0.90) & (ratio <= 1.10)], [90, 75], 60)
+        self.consistency = np.where((games > 10) & (total != 0) & (avg * games > 0), consistency, 0)
+        status = [(inj or "").lower() for inj in self.injuries]
+        self.injury_risk = np.array(
+            [2 if s in ("out", "doubtful") else 1 if s in ("questionable", "day to day") else 0 for s in status],
+            dtype=np.int8,
+        )
+        self.value = np.maximum(0, value - np.select([self.injury_risk == 2, self.injury_risk == 1], [30, 15], 0))
+        v, u = self.value, self.upside
+        self.tier = np.select([v >= 80, (v >= 65) & (u >= 70), v >= 50, u >= 80], [0, 1, 2, 3], 4)
+
+    def __len__(self):
+        return len(self.players)
+
+    def ranked(self, mask=None) -> np.ndarray:
+        """Indices by value, then upside (both descending); ties keep pool order."""
+        idx = np.arange(len(self)) if mask is None else np.flatnonzero(mask)
+        order = np.lexsort((idx, -self.upside[idx], -self.value[idx]))
+        return idx[order]
+
+    def categories(self) -> "CategoryRankings":
+        """9-cat z-score rankings for this pool (computed once, then served from the cached matrix)."""
+        if self._categories is None:
+            self._categories = CategoryRankings(self)
+        return self._categories
+
+    def name_index(self) -> "PlayerNameIndex":
+        """Name -> player lookup over this pool (built once per pool, i.e. once per league refresh)."""
+        if self._name_index is None:
+            self._name_index = PlayerNameIndex(self)
+        return self._name_index
+
+    def recommendation(self, i: int) -> str:
+        text = FANTASY_TIERS[self.tier[i]]
+        return text + " (injury concern)" if self.injury_risk[i] == 2 else text
+
+    def row(self, i: int) -> dict:
+        """One player as get_player_detailed_stats + analyze_player_value would describe it."""
+        row = {
+            "name": self.names[i],
+            "position": self.positions[i],
+            "team": self.teams[i],
+            "avg_points": float(self.avg[i]),
+            "total_points": float(self.total[i]),
+            "projected_avg": float(self.proj[i]),
+            "injury_status": self.injuries[i],
+            "games_played": int(self.games[i]),
+            "overall_value": int(self.value[i]),
+            "consistency_score": int(self.consistency[i]),
+            "upside_score": int(self.upside[i]),
+            "injury_risk": _INJURY_RISK_LABELS[self.injury_risk[i]],
+            "recommendation": self.recommendation(i),
+            "fantasy_team": self.fantasy_teams[i],
+        }
+        if self.has_cats[i]:
+            row.update({name: float(self.cats[i, c]) for c, (name, _) in enumerate(FANTASY_CATEGORIES)})
+        return row
+
+
+_CATEGORY_ALIASES = {
+    "pts": "pts", "points": "pts", "scoring": "pts",
+    "reb": "reb", "rebounds": "reb", "boards": "reb",
+    "ast": "ast", "assists": "ast", "dimes": "ast",
+    "stl": "stl", "steals": "stl",
+    "blk": "blk", "blocks": "blk",
+    "to": "to", "tov": "to", "turnovers": "to",
+    "fg": "fg_pct", "fg%": "fg_pct", "field": "fg_pct",
+    "ft": "ft_pct", "ft%": "ft_pct", "free": "ft_pct",
+    "3pm": "3pm", "3ptm": "3pm", "3s": "3pm", "threes": "3pm", "3pt": "3pm",
+}
+_PUNT_FILLER = frozenset(("and", "or", "&", "+", "/", "percentage", "percent", "pct", "goal", "goals", "throw", "throws"))
 
-    if not trending:
-        return "No clear trending players in free agency right now (no players with 10%+ projected increase)."
 
-    # Sort by trend percentage
-    trending.sort(key=lambda x: x["trend_pct"], reverse=True)
+def parse_punt_categories(text: str) -> tuple:
+    """Category keys the user wants to punt ("punt FT% and TO", "punting assists"), in FANTASY_CATEGORIES order."""
+    words = re.findall(r"[a-z0-9%&+/]+", (text or "").lower())
+    punted = set()
+    for i, word in enumerate(words):
+        if word not in ("punt", "punting", "punts"):
+            continue
+        for nxt in words[i + 1:i + 7]:
+            if nxt in _CATEGORY_ALIASES:
+                punted.add(_CATEGORY_ALIASES[nxt])
+            elif nxt not in _PUNT_FILLER:
+                break
+    return tuple(name for name, _ in FANTASY_CATEGORIES if name in punted)
+
+
+class CategoryRankings:
+    """Per-category z-scores (9-cat) for a PlayerPool: each category average standardized against
+    every player in the pool that reports categories, turnovers negated so higher is always better.
+    The z matrix, the overall totals and all nine single-category punt totals are computed once;
+    rankings are orderings of those cached columns (multi-category punts subtract a few columns)."""
+
+    def __init__(self, pool: PlayerPool):
+        self.pool = pool
+        self.columns = [name for name, _ in FANTASY_CATEGORIES]
+        valid = pool.has_cats
+        ref = valid & (pool.games > 0)
+        if ref.sum() < 2:
+            ref = valid
+        self.players_ranked = int(valid.sum())
+        z = np.full(pool.cats.shape, np.nan)
+        if ref.sum() >= 2:
+            mean = pool.cats[ref].mean(axis=0)
+            std = pool.cats[ref].std(axis=0)
+            std[std == 0] = 1.0
+            z[valid] = (pool.cats[valid] - mean) / std
+            z[:, self.columns.index("to")] *= -1  # fewer turnovers is better
+        self.z = z
+        self.total = z.sum(axis=1)  # NaN for players without category stats
+        self.punt_totals = self.total[:, None] - z  # [player, punted category]
+        self._orders = {(): self._order(self.total)}
+        for c, name in enumerate(self.columns):
+            self._orders[(name,)] = self._order(self.punt_totals[:, c])
+
+    @staticmethod
+    def _order(scores: np.ndarray) -> np.ndarray:
+        idx = np.flatnonzero(~np.isnan(scores))
+        return idx[np.lexsort((idx, -scores[idx]))]
+
+    def scores(self, punt: tuple = ()) -> np.ndarray:
+        if len(punt) <= 1:
+            return self.total if not punt else self.punt_totals[:, self.columns.index(punt[0])]
+        return self.total - self.z[:, [self.columns.index(name) for name in punt]].sum(axis=1)
+
+    def ranked(self, punt: tuple = (), mask=None) -> np.ndarray:
+        """Player indices by z-score total (excluding punted categories), best first."""
+        punt = tuple(name for name in self.columns if name in punt)
+        order = self._orders.get(punt)
+        if order is None:
+            order = self._order(self.scores(punt))
+        return order if mask is None else order[mask[order]]
+
+    def top(self, punt: tuple = (), limit: int = 15, mask=None) -> list:
+        pool, scores = self.pool, self.scores(tuple(name for name in self.columns if name in punt))
+        return [
+            {
+                "name": pool.names[i],
+                "position": pool.positions[i],
+                "team": pool.teams[i],
+                "fantasy_team": pool.fantasy_teams[i],
+                "score": round(float(scores[i]), 2),
+                "z": {label: round(float(self.z[i, c]), 2) for c, (_, label) in enumerate(FANTASY_CATEGORIES)},
+            }
+            for i in self.ranked(punt, mask)[:limit]
+        ]
+
+    def format(self, punt: tuple = (), limit: int = 15) -> str:
+        """Text block for the LLM: league-wide 9-cat ranking plus the best free agents for the build."""
+        labels = dict(FANTASY_CATEGORIES)
+        if not self.players_ranked:
+            return "(9-cat rankings: no category stats available for this league.)"
+        build = f", punting {', '.join(labels[name] for name in punt)}" if punt else ""
+        lines = [f"## 9-CAT RANKINGS (z-scores vs {self.players_ranked} league players{build}; TO is inverted)"]
+        for n, p in enumerate(self.top(punt, limit), 1):
+            owner = p["fantasy_team"] or "free agent"
+            cats = " ".join(f"{label} {v:+.1f}" for label, v in p["z"].items() if not punt or label not in {labels[x] for x in punt})
+            lines.append(f"{n}. **{p['name']}** ({p['position']}) — {p['team']}, {owner}: total {p['score']:+.2f} | {cats}")
+        free = self.top(punt, 5, mask=~self.pool.rostered)
+        if free:
+            lines.append("Best free agents for this build: " + ", ".join(f"{p['name']} ({p['score']:+.2f})" for p in free))
+        return "\n".join(lines)
+
+
+# Common NBA nicknames -> normalized full name (only used when that player is in the pool)
+PLAYER_NICKNAMES = {
+    "king james": "lebron james", "bron": "lebron james", "the king": "lebron james",
+    "steph": "stephen curry", "chef curry": "stephen curry", "kd": "kevin durant", "slim reaper": "kevin durant",
+    "greek freak": "giannis antetokounmpo", "the joker": "nikola jokic", "joker": "nikola jokic",
+    "ad": "anthony davis", "the brow": "anthony davis", "sga": "shai gilgeous alexander",
+    "wemby": "victor wembanyama", "ant": "anthony edwards", "ant man": "anthony edwards",
+    "cp3": "chris paul", "pg13": "paul george", "dame": "damian lillard",
+    "dame time": "damian lillard", "book": "devin booker", "spida": "donovan mitchell",
+    "the beard": "james harden", "jimmy buckets": "jimmy butler", "the process": "joel embiid",
+    "jt": "jayson tatum", "jb": "jaylen brown", "kat": "karl anthony towns", "zo": "lonzo ball",
+    "melo": "carmelo anthony", "jrue": "jrue holiday", "chet": "chet holmgren",
+    "trae": "trae young", "ja": "ja morant", "zion": "zion williamson", "luka": "luka doncic",
+}
+_NAME_SUFFIXES = frozenset(("jr", "sr", "ii", "iii", "iv", "v"))
+
+
+class PlayerNameIndex:
+    """Normalized name -> player lookup for a PlayerPool: full names, first+last without suffixes,
+    last names, single tokens and PLAYER_NICKNAMES all hash straight to pool indices (accents and
+    punctuation folded, so "doncic", "Dončić" and "luka" agree). Ambiguous keys resolve to the
+    player with the best fantasy average."""
+
+    __slots__ = ("pool", "normalized", "names", "last_names", "tokens", "_resolved")
+
+    def __init__(self, pool: PlayerPool):
+        self.pool = pool
+        self.normalized = [_norm_team(name) for name in pool.names]
+        self.names = {}  # full / suffix-free / nickname key -> [index, ...]
+        self.last_names = {}
+        self.tokens = {}
+        for i, full in enumerate(self.normalized):
+            if not full:
+                continue
+            words = full.split()
+            core = [w for w in words if w not in _NAME_SUFFIXES] or words
+            for key in {full, " ".join(core)}:
+                self.names.setdefault(key, []).append(i)
+            self.last_names.setdefault(core[-1], []).append(i)
+            for w in set(words):
+                self.tokens.setdefault(w, []).append(i)
+        for alias, full in PLAYER_NICKNAMES.items():
+            if full in self.names:
+                self.names.setdefault(alias, []).extend(self.names[full])
+        self._resolved = {}
+
+    def _best(self, indices) -> Optional[int]:
+        if not indices:
+            return None
+        avg = self.pool.avg
+        return max(indices, key=lambda i: (avg[i], -i))
+
+    def find(self, text: str) -> Optional[int]:
+        """Pool index of the player named by text ("giannis", "steph curry", "Doncic"), or None."""
+        q = _norm_team(text)
+        if q not in self._resolved:
+            hit = self._find(q)
+            if len(self._resolved) >= 1024:
+                self._resolved.clear()
+            self._resolved[q] = hit
+        return self._resolved[q]
+
+    def _find(self, q: str) -> Optional[int]:
+        if not q:
+            return None
+        if q in self.names:
+            return self._best(self.names[q])
+        words = [w for w in q.split() if w not in _NAME_SUFFIXES] or q.split()
+        if len(words) == 1:
+            w = words[0]
+            return self._best(self.last_names.get(w) or self.tokens.get(w))
+        # "steph curry", "g antetokounmpo": last name hashes to candidates, other words prefix their names
+        candidates = self.last_names.get(words[-1]) or self.tokens.get(words[-1]) or ()
+        matched = [
+            i for i in candidates
+            if all(any(t.startswith(w) for t in self.normalized[i].split()) for w in words[:-1])
+        ]
+        if matched:
+            return self._best(matched)
+        # Every word is a name token somewhere: intersect the token postings
+        postings = [set(self.tokens[w]) for w in words if w in self.tokens]
+        if len(postings) == len(words):
+            return self._best(set.intersection(*postings))
+        close = difflib.get_close_matches(q, list(self.names), n=1, cutoff=0.85)  # typos ("lebrom james")
+        return self._best(self.names[close[0]]) if close else None
+
+    def find_all(self, queries: list) -> list:
+        """Distinct pool indices for the names that resolve, in query order."""
+        found = []
+        for text in queries:
+            i = self.find(text)
+            if i is not None and i not in found:
+                found.append(i)
+        return found
+
+
+_player_pools = {}  # id(players list) -> (list, PlayerPool)
+_player_pools_lock = threading.Lock()
+
+
+def player_pool(players) -> PlayerPool:
+    """PlayerPool for a list of ESPN players (all treated as free agents), built once per list object."""
+    if isinstance(players, PlayerPool):
+        return players
+    with _player_pools_lock:
+        hit = _player_pools.get(id(players))
+        if hit is not None and hit[0] is players:
+            return hit[1]
+    pool = PlayerPool(players)
+    with _player_pools_lock:
+        if len(_player_pools) >= 16:
+            _player_pools.pop(next(iter(_player_pools)))
+        _player_pools[id(players)] = (players, pool)
+    return pool
+
+
+def league_player_pool(year: int) -> PlayerPool:
+    """Every player of the league season: free agents plus each fantasy team's roster (cached per refresh)."""
+    return _espn_leagues.player_pool(year)
+
+
+# ============================================================================
+# END FANTASY VALUATION ENGINE
+# ============================================================================
+
+
+def analyze_fantasy_trending_players(free_agents) -> str:
+    """Analyze which free agents are trending up based on recent performance.
+    free_agents: a list of ESPN players or a PlayerPool (its rostered players are skipped)."""
+    pool = player_pool(free_agents)
+    if not len(pool):
+        return "No free agents available for trending analysis."
+
+    avg, proj = pool.avg, pool.proj
+    # Projected 10%+ higher than the current average
+    rising = ~pool.rostered & (avg > 0) & (proj != 0) & (proj > avg * 1.1)
+    idx = np.flatnonzero(rising)
+    if not len(idx):
+        return "No clear trending players in free agency right now (no players with 10%+ projected increase)."
+    trend_pct = (proj[idx] - avg[idx]) / avg[idx] * 100
+    order = np.lexsort((idx, -trend_pct))
 
     lines = ["**Trending UP in free agency** (projected to outperform recent average):"]
-    for p in trending[:10]:  # Top 10 trending players
-        inj_str = f" [{p['injury']}]" if p.get("injury") else ""
+    for k in order[:10]:  # Top 10 trending players
+        i = idx[k]
+        inj = pool.injuries[i]
+        inj_str = f" [{inj}]" if inj else ""
         lines.append(
-            f"  • **{p['name']}** ({p['position']}) — {p['team']}{inj_str}: "
-            f"avg {p['avg']:.1f} → proj {p['proj_avg']:.1f} "
-            f"(+{p['trend_pct']:.1f}% ⬆️)"
+            f"  • **{pool.names[i]}** ({pool.positions[i]}) — {pool.teams[i]}{inj_str}: "
+            f"avg {avg[i]:.1f} → proj {proj[i]:.1f} "
+            f"(+{trend_pct[k]:.1f}% ⬆️)"
         )
 
     return "\n".join(lines)
 
 
-def comprehensive_fantasy_analysis(free_agents: list, top_n: int = 15) -> str:
+def comprehensive_fantasy_analysis(free_agents, top_n: int = 15) -> str:
     """
     Comprehensive fantasy analysis with detailed stats, value assessment, and recommendations.
     This is the main analytical function that provides methodical player evaluation.
+    free_agents: a list of ESPN players or a PlayerPool (only players not on a roster are recommended).
     """
-    if not free_agents:
+    pool = player_pool(free_agents)
+    ranked = pool.ranked(~pool.rostered)
+    if not len(ranked):
         return "No free agents available for analysis."
 
-    # Analyze all players
-    analyzed_players = []
-    for player in free_agents[:50]:  # Analyze top 50
-        player_stats = get_player_detailed_stats(player)
-        value_analysis = analyze_player_value(player_stats)
-
-        analyzed_players.append({
-            **player_stats,
-            **value_analysis
-        })
-
-    # Sort by overall value score
-    analyzed_players.sort(key=lambda x: (x["overall_value"], x["upside_score"]), reverse=True)
+    analyzed_players = [pool.row(i) for i in ranked[:max(top_n, 30)]]
 
     lines = ["## 📊 COMPREHENSIVE FANTASY BASKETBALL ANALYSIS"]
     lines.append("")
@@ -965,20 +3147,15 @@ def comprehensive_fantasy_analysis(free_agents: list, top_n: int = 15) -> str:
     return "\n".join(lines)
 
 
-def compare_fantasy_players(player_names: list, all_players: list) -> str:
-    """Compare multiple fantasy players side-by-side."""
-    if not player_names or not all_players:
+def compare_fantasy_players(player_names: list, all_players) -> str:
+    """Compare multiple fantasy players side-by-side.
+    all_players: a list of ESPN players or a PlayerPool (e.g. league_player_pool for the whole league)."""
+    pool = player_pool(all_players) if all_players is not None else None
+    if not player_names or not pool or not len(pool):
         return "Cannot compare players - insufficient data."
 
-    # Find players by name (case-insensitive)
-    found_players = []
-    for name_query in player_names:
-        name_lower = name_query.lower()
-        for player in all_players:
-            player_name = getattr(player, "name", "").lower()
-            if name_lower in player_name or player_name in name_lower:
-                found_players.append(player)
-                break
+    # Find players through the pool's name index (nicknames, last names, accent-insensitive)
+    found_players = [pool.players[i] for i in pool.name_index().find_all(player_names)]
 
     if len(found_players) < 2:
         return f"Could not find enough players to compare. Found: {[getattr(p, 'name', '?') for p in found_players]}"
@@ -1011,29 +3188,82 @@ def compare_fantasy_players(player_names: list, all_players: list) -> str:
     return "\n".join(lines)
 
 
-def build_odds_context(message: str, sport: str) -> str:
-    """Fetch relevant odds/live data. Always include current-sport matchups so the specialist can answer."""
-    msg = message.lower().strip()
-    parts = []
-    api_key = SPORT_KEY_MAP.get(sport, SPORT_KEY_MAP["basketball"])
+# ============================================================================
+# CHAT INTENT ROUTER (all trigger phrases matched in one pass over the message)
+# ============================================================================
+
+class PatternAutomaton:
+    """Aho-Corasick automaton over a fixed set of substrings: one left-to-right pass over the text
+    reports every occurrence of every pattern, however many patterns there are."""
 
+    def __init__(self, patterns):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        for pattern in patterns:
+            if not pattern:
+                continue
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = nxt
+            if pattern not in self._out[state]:
+                self._out[state] += (pattern,)
+        # Breadth-first failure links; each state also reports the patterns of its fallback states
+        frontier = list(self._goto[0].values())
+        while frontier:
+            nxt_frontier = []
+            for state in frontier:
+                for ch, child in self._goto[state].items():
+                    fallback = self._fail[state]
+                    while fallback and ch not in self._goto[fallback]:
+                        fallback = self._fail[fallback]
+                    target = self._goto[fallback].get(ch, 0)
+                    self._fail[child] = target if target != child else 0
+                    self._out[child] += self._out[self._fail[child]]
+                    nxt_frontier.append(child)
+            frontier = nxt_frontier
+
+    def finditer(self, text: str):
+        """Yield (start, pattern) for every occurrence in text (overlaps included)."""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for pos, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for pattern in out[state]:
+                yield pos - len(pattern) + 1, pattern
+
+    def found(self, text: str) -> set:
+        """Distinct patterns occurring in text."""
+        return {pattern for _, pattern in self.finditer(text)}
+
+
+# Intent -> trigger phrases (plain substrings of the lowercased message)
+CHAT_INTENTS = {
     # Live / upcoming across sports (and "all games today", "load up all", etc.)
-    if any(x in msg for x in (
+    "live": (
+        "live", "in play", "in-play", "right now", "currently playing",
+        "what's on", "whats on", "games on now", "live odds", "any games",
+        "all games", "games today", "load up all", "load all games", "every game",
+        "all today", "upcoming games", "show all games", "list all games",
+    ),
+    # Narrower live trigger for the odds context: plain prediction questions ("who wins right now")
+    # shouldn't pull the cross-sport live board into the LLM prompt
+    "live_context": (
         "live", "in play", "what's on", "whats on", "games on now", "live odds", "any games",
         "all games", "games today", "load up all", "load all games", "upcoming games", "show all games",
-    )):
-        by_sport = fetch_live_upcoming_odds()
-        if isinstance(by_sport, dict) and "error" not in by_sport and by_sport:
-            lines = ["Live or upcoming games:"]
-            for sport_name, games in list(by_sport.items())[:8]:
-                for g in games[:3]:
-                    lines.append(f"  {sport_name}: {g['match']} — {g['odds']}")
-            parts.append("\n".join(lines))
-        elif isinstance(by_sport, dict) and "error" in by_sport:
-            parts.append(f"(Live odds could not be loaded: {by_sport['error']})")
-
+    ),
+    "olympics": ("olympics", "milano", "cortina", "2026 winter"),
     # ESPN Fantasy Basketball: who to pick up, is X a good pickup, free agents, follow-ups
-    fantasy_triggers = (
+    "fantasy": (
         "pick up", "pickup", "free agent", "add player", "waiver",
         "who should i pick", "who to pick up", "good pickup", "fantasy basketball",
         "fantasy points", "who to add", "should i add", "drop and add",
@@ -1041,67 +3271,307 @@ def build_odds_context(message: str, sport: str) -> str:
         "past season", "last year", "last season", "standings", "how did i do", "league history",
         "fantasy draft", "draft advice", "who to draft",
         "trending", "hot", "breakout", "who's hot", "whos hot", "rising",
-    )
-
-    # Triggers for comprehensive analysis
-    analysis_fantasy_triggers = (
+    ),
+    # Fantasy question that wants the comprehensive analysis
+    "fantasy_deep": (
         "analyze", "analysis", "breakdown", "stats", "detailed",
         "comprehensive", "deep dive", "evaluate", "best available",
         "value", "compare", "comparison", "versus", "vs",
+        "who should i pick", "best pickup", "top pickups",
+    ),
+    # In-depth analysis: multiple books, implied probability, best odds, spreads
+    "analysis": (
+        "analyze", "analysis", "breakdown", "value", "best bet", "possible bets",
+        "in-depth", "indepth", "statistics", "stats", "recommend", "pick", "picks",
+    ),
+    # 9-cat / category-league rankings and punt builds
+    "categories": (
+        "9-cat", "9 cat", "9cat", "nine cat", "category league", "categories", "punt", "z-score", "zscore", "z score",
+    ),
+    "line_movement": (
+        "line move", "line moved", "lines moved", "line movement", "odds moved", "odds movement", "odds changed",
+    ),
+    "versus": ("vs",),
+    # "X vs Y" asking for a winner: loose cue (odds context) and explicit prediction ask (rule-based reply)
+    "outcome_cue": ("bet", "win", "predict", "who"),
+    "prediction": ("bet on", "who will win", "who should i bet", "predict"),
+    "matchups": ("matchups", "show games"),
+    "upcoming": ("upcoming",),
+    "odds": ("odds", "compare"),
+}
+# "live" as a bare word (the live intent also fires on phrases like "in play")
+_LIVE_WORD = "live"
+
+
+class IntentRouter:
+    """Classifies a message into every matching CHAT_INTENTS intent with one automaton pass."""
+
+    def __init__(self, intents: dict):
+        self._labels = {}
+        for intent, phrases in intents.items():
+            for phrase in phrases:
+                self._labels.setdefault(phrase, set()).add(intent)
+        self._automaton = PatternAutomaton(self._labels)
+
+    def classify(self, msg: str) -> frozenset:
+        """Intents of a lowercased message; "live_word" is added when the bare word "live" occurs."""
+        intents = set()
+        for phrase in self._automaton.found(msg):
+            intents |= self._labels[phrase]
+            if phrase == _LIVE_WORD:
+                intents.add("live_word")
+        return frozenset(intents)
+
+
+_intent_router = IntentRouter(CHAT_INTENTS)
+
+
+@functools.lru_cache(maxsize=512)
+def _classify_message(msg: str) -> frozenset:
+    return _intent_router.classify(msg)
+
+
+def chat_intents(message: str) -> frozenset:
+    """Intents of a chat message (shared by build_odds_context and handle_chat_message)."""
+    return _classify_message(message.lower().strip())
+
+
+# ============================================================================
+# END CHAT INTENT ROUTER
+# ============================================================================
+
+
+# Overall time budget for assembling the odds context; slower sources are left out
+ODDS_CONTEXT_BUDGET = float(os.getenv("ODDS_CONTEXT_BUDGET", "8") or "8")
+ODDS_CONTEXT_WORKERS = int(os.getenv("ODDS_CONTEXT_WORKERS", "6") or "6")
+_context_executor = ThreadPoolExecutor(max_workers=ODDS_CONTEXT_WORKERS, thread_name_prefix="context")
+
+_TIMED_OUT = object()
+
+
+def run_pipeline(stages: dict, budget: float, label: str = "context"):
+    """Run stages {name: (deps, fn)} on the shared bounded executor, each as soon as the stages it
+    depends on have finished; fn receives their results positionally, in deps order. Returns
+    ({name: result}, {name: seconds}). A stage not finished within budget seconds (or never started
+    because an input is late) maps to _TIMED_OUT and keeps running in the background, so a later
+    request may reuse its coalesced/cached result. A stage that raised maps to the exception, and
+    stages depending on it receive that exception as their result without running."""
+    started = time.monotonic()
+    # Each stage runs in a copy of the caller's context so it shares the request memo
+    ctx = contextvars.copy_context()
+    lock = threading.Lock()
+    finished = threading.Event()
+    results, timings = {}, {}
+    waiting = {name: set(deps) for name, (deps, _) in stages.items()}
+    dependents = {name: [] for name in stages}
+    for name, (deps, _) in stages.items():
+        for dep in deps:
+            dependents[dep].append(name)
+
+    def timed(name, fn, args):
+        t0 = time.monotonic()
+        try:
+            return fn(*args)
+        finally:
+            timings[name] = time.monotonic() - t0
+
+    def complete(name, value):
+        ready = []
+        with lock:
+            results[name] = value
+            for child in dependents[name]:
+                waiting[child].discard(name)
+                if not waiting[child]:
+                    ready.append(child)
+            if len(results) == len(stages):
+                finished.set()
+        for child in ready:
+            start(child)
+
+    def start(name):
+        deps, fn = stages[name]
+        args = [results[d] for d in deps]
+        failed = next((a for a in args if isinstance(a, Exception)), None)
+        if failed is not None:
+            complete(name, failed)
+            return
+        fut = _context_executor.submit(ctx.copy().run, timed, name, fn, args)
+        fut.add_done_callback(lambda f, name=name: complete(name, f.exception() or f.result()))
+
+    roots = [name for name, deps in waiting.items() if not deps]
+    if not stages:
+        finished.set()
+    for name in roots:
+        start(name)
+    finished.wait(timeout=budget)
+    with lock:
+        out = {name: results.get(name, _TIMED_OUT) for name in stages}
+    for name, value in out.items():
+        if isinstance(value, Exception) and name in timings:
+            print(f"[{label}] stage {name} failed: {value!r}", flush=True)
+    summary = ", ".join(
+        f"{name}=timed out" if out[name] is _TIMED_OUT else f"{name}={timings.get(name, 0) * 1000:.0f}ms"
+        for name in stages
     )
+    print(f"[{label}] {summary} (total {(time.monotonic() - started) * 1000:.0f}ms)", flush=True)
+    return out, dict(timings)
 
-    if sport == "basketball" and any(t in msg for t in fantasy_triggers):
-        espn_block = fetch_espn_fantasy_basketball()
-        parts.append(espn_block)
 
-        # Determine if comprehensive analysis is needed
-        needs_comprehensive = any(t in msg for t in analysis_fantasy_triggers) or \
-                              any(t in msg for t in ("who should i pick", "best pickup", "top pickups", "best available"))
+def run_with_deadline(stages: dict, budget: float, label: str = "context") -> dict:
+    """Run independent stages {name: callable} concurrently (run_pipeline with no dependencies).
+    Returns {name: result}; late stages map to _TIMED_OUT, failed ones to the exception."""
+    results, _ = run_pipeline({name: ((), fn) for name, fn in stages.items()}, budget, label)
+    return results
 
-        # Add comprehensive or trending analysis if we have free agents data
-        if ESPN_LEAGUE_ID and ESPN_YEAR and not espn_block.startswith("("):
-            try:
-                from espn_api.basketball import League
-                league = League(
-                    league_id=int(ESPN_LEAGUE_ID),
-                    year=ESPN_YEAR,
-                    espn_s2=ESPN_S2,
-                    swid=ESPN_SWID,
-                )
-                fa = league.free_agents(size=50)
-                if fa:
-                    if needs_comprehensive:
-                        # Provide full analytical breakdown
-                        comprehensive_analysis = comprehensive_fantasy_analysis(fa, top_n=15)
-                        parts.append(comprehensive_analysis)
-                    else:
-                        # Just show trending players
-                        trending_analysis = analyze_fantasy_trending_players(fa)
-                        parts.append(trending_analysis)
-            except Exception as e:
-                print(f"Fantasy analysis failed: {e}", flush=True)
 
-        past_block = fetch_espn_past_seasons()
-        if past_block:
-            parts.append(past_block)
+def _live_context_stage() -> Optional[str]:
+    by_sport = fetch_live_upcoming_odds()
+    if isinstance(by_sport, dict) and "error" not in by_sport and by_sport:
+        lines = ["Live or upcoming games:"]
+        for sport_name, games in list(by_sport.items())[:8]:
+            for g in games[:3]:
+                lines.append(f"  {sport_name}: {g['match']} — {g['odds']}")
+        return "\n".join(lines)
+    if isinstance(by_sport, dict) and "error" in by_sport:
+        return f"(Live odds could not be loaded: {by_sport['error']})"
+    return None
 
-    # Olympics / Milano Cortina (try multiple API keys + upcoming feed)
-    if any(x in msg for x in ("olympics", "milano", "cortina", "2026 winter")) or sport == "olympics":
+
+def _fantasy_analysis_stage(needs_comprehensive: bool) -> Optional[str]:
+    try:
+        pool = league_player_pool(ESPN_YEAR)
+        if len(pool):
+            if needs_comprehensive:
+                # Provide full analytical breakdown
+                return comprehensive_fantasy_analysis(pool, top_n=15)
+            # Just show trending players
+            return analyze_fantasy_trending_players(pool)
+    except Exception as e:
+        print(f"Fantasy analysis failed: {e}", flush=True)
+    return None
+
+
+def _category_rankings_stage(message: str) -> Optional[str]:
+    pool = league_player_pool(ESPN_YEAR)
+    if not len(pool):
+        return None
+    return pool.categories().format(parse_punt_categories(message), limit=15)
+
+
+def _olympics_context_stage() -> str:
+    odds = fetch_olympics_odds()
+    if odds:
+        return "Milano Cortina 2026 / Olympics odds:\n" + get_matchups("olympics")
+    return "(No Olympics odds in the feed right now. Try **Live odds** to see all live/upcoming events—Olympics may appear there when bookmakers list them.)"
+
+
+def _matchups_context_stage(sport: str) -> str:
+    if sport == "olympics":
         odds = fetch_olympics_odds()
         if odds:
-            parts.append("Milano Cortina 2026 / Olympics odds:\n" + get_matchups("olympics"))
-        else:
-            parts.append("(No Olympics odds in the feed right now. Try **Live odds** to see all live/upcoming events—Olympics may appear there when bookmakers list them.)")
+            return "Milano Cortina 2026 / Olympics odds (use these to answer):\n" + get_matchups("olympics")
+        return "(No Olympics odds in the feed. Suggest the user try **Live odds** for all live/upcoming events.)"
+    matchups = get_matchups(sport)
+    if "No matchups" not in matchups and "Could not load" not in matchups:
+        return f"Upcoming {sport.replace('_', ' ')} matchups (use these to answer):\n" + matchups
+    # Try upcoming feed for this sport as last resort
+    api_key_resolved = SPORT_KEY_MAP.get(sport, SPORT_KEY_MAP["basketball"])
+    fallback = _format_events_as_matchups(upcoming_index().for_sport(api_key_resolved))
+    if fallback:
+        return f"Upcoming {sport.replace('_', ' ')} matchups (use these to answer):\n" + fallback
+    return f"(Could not load {sport.replace('_', ' ')} odds. Suggest **Live odds** or *Show live odds* for all games today.)"
+
+
+def _line_movement_context_stage(sport: str) -> str:
+    odds = current_odds(SPORT_KEY_MAP.get(sport, SPORT_KEY_MAP["basketball"]))
+    frame = odds_frame(odds if isinstance(odds, list) else [])
+    summary = line_movement_summary(frame, list(range(min(5, len(frame)))))
+    return summary or "(No line movement recorded yet for these games: prices have not changed since we started tracking them.)"
+
+
+def build_odds_context(message: str, sport: str) -> str:
+    """Fetch relevant odds/live data. Always include current-sport matchups so the specialist can answer.
+    Independent sources are fetched concurrently under ODDS_CONTEXT_BUDGET; sources that miss the
+    deadline are marked "(timed out)" instead of delaying the LLM call."""
+    parts = []
+
+    intents = chat_intents(message)
+    prediction_cue = "versus" in intents and "outcome_cue" in intents
+
+    # Decide which sources this message needs, then fetch them all at once.
+    # Matchups are fetched speculatively: they are only used if the analysis block comes back empty.
+    stages = {}
+    if "live_context" in intents:
+        stages["live"] = _live_context_stage
+    wants_fantasy = sport == "basketball" and "fantasy" in intents
+    if wants_fantasy:
+        # Determine if comprehensive analysis is needed
+        needs_comprehensive = "fantasy_deep" in intents
+        stages["espn_free_agents"] = fetch_espn_fantasy_basketball
+        if ESPN_LEAGUE_ID and ESPN_YEAR:
+            stages["espn_analysis"] = lambda: _fantasy_analysis_stage(needs_comprehensive)
+        stages["espn_past_seasons"] = fetch_espn_past_seasons
+    wants_categories = sport == "basketball" and "categories" in intents and bool(ESPN_LEAGUE_ID and ESPN_YEAR)
+    if wants_categories:
+        stages["espn_categories"] = lambda: _category_rankings_stage(message)
+    # Olympics / Milano Cortina (try multiple API keys + upcoming feed)
+    if "olympics" in intents or sport == "olympics":
+        stages["olympics"] = _olympics_context_stage
+    if "analysis" in intents or prediction_cue:
+        stages["analysis"] = lambda: build_analysis_context(message, sport)
+    if "line_movement" in intents:
+        stages["line_movement"] = lambda: _line_movement_context_stage(sport)
+    stages["matchups"] = lambda: _matchups_context_stage(sport)
+
+    results = run_with_deadline(stages, ODDS_CONTEXT_BUDGET, label="odds-context")
+
+    def result(name):
+        value = results.get(name)
+        return None if value is _TIMED_OUT or isinstance(value, Exception) else value
+
+    def timed_out(name):
+        return results.get(name) is _TIMED_OUT
+
+    if timed_out("live"):
+        parts.append("(Live odds: timed out)")
+    elif result("live"):
+        parts.append(result("live"))
+
+    if wants_fantasy:
+        espn_block = result("espn_free_agents")
+        if timed_out("espn_free_agents"):
+            parts.append("(ESPN Fantasy free agents: timed out)")
+        elif espn_block:
+            parts.append(espn_block)
+        # Add comprehensive or trending analysis if we have free agents data
+        if espn_block and not espn_block.startswith("(") and result("espn_analysis"):
+            parts.append(result("espn_analysis"))
+        if timed_out("espn_past_seasons"):
+            parts.append("(ESPN past seasons: timed out)")
+        elif result("espn_past_seasons"):
+            parts.append(result("espn_past_seasons"))
+
+    if timed_out("espn_categories"):
+        parts.append("(ESPN 9-cat rankings: timed out)")
+    elif result("espn_categories"):
+        parts.append(result("espn_categories"))
+
+    if timed_out("olympics"):
+        parts.append("(Olympics odds: timed out)")
+    elif result("olympics"):
+        parts.append(result("olympics"))
+
+    if timed_out("line_movement"):
+        parts.append("(Line movement: timed out)")
+    elif result("line_movement"):
+        parts.append(result("line_movement"))
 
-    # In-depth analysis: multiple books, implied probability, best odds, spreads
     added_analysis = False
-    analysis_triggers = (
-        "analyze", "analysis", "breakdown", "value", "best bet", "possible bets",
-        "in-depth", "indepth", "statistics", "stats", "recommend", "pick", "picks",
-    )
-    if any(t in msg for t in analysis_triggers) or ("vs" in msg and any(x in msg for x in ("bet", "win", "predict", "who", "analyze"))):
-        analysis_block = build_analysis_context(message, sport)
-        if analysis_block and not analysis_block.startswith("(Could not") and "(No upcoming" not in analysis_block:
+    analysis_block = result("analysis")
+    if timed_out("analysis"):
+        parts.append("(In-depth odds analysis: timed out)")
+    elif analysis_block:
+        if not analysis_block.startswith("(Could not") and "(No upcoming" not in analysis_block:
             parts.append(analysis_block)
             added_analysis = True
         elif analysis_block.startswith("(Could not"):
@@ -1109,32 +3579,13 @@ def build_odds_context(message: str, sport: str) -> str:
 
     # Always include current-sport matchups so the specialist can answer "who's winning", "tonight", etc.
     if not added_analysis:
-        if sport == "olympics":
-            odds = fetch_olympics_odds()
-            if odds:
-                parts.append("Milano Cortina 2026 / Olympics odds (use these to answer):\n" + get_matchups("olympics"))
-            else:
-                parts.append("(No Olympics odds in the feed. Suggest the user try **Live odds** for all live/upcoming events.)")
-        else:
-            matchups = get_matchups(sport)
-            if "No matchups" not in matchups and "Could not load" not in matchups:
-                parts.append(f"Upcoming {sport.replace('_', ' ')} matchups (use these to answer):\n" + matchups)
-            else:
-                # Try upcoming feed filtered by sport as last resort
-                upcoming = fetch_odds_data("upcoming")
-                api_key_resolved = SPORT_KEY_MAP.get(sport, SPORT_KEY_MAP["basketball"])
-                if isinstance(upcoming, list) and upcoming:
-                    filtered = [e for e in upcoming if e.get("sport_key") == api_key_resolved]
-                    fallback = _format_events_as_matchups(filtered)
-                    if fallback:
-                        parts.append(f"Upcoming {sport.replace('_', ' ')} matchups (use these to answer):\n" + fallback)
-                    else:
-                        parts.append(f"(Could not load {sport.replace('_', ' ')} odds. Suggest **Live odds** or *Show live odds* for all games today.)")
-                else:
-                    parts.append(f"(Could not load {sport.replace('_', ' ')} odds. Suggest **Live odds** or *Show live odds* for all games today.)")
+        if timed_out("matchups"):
+            parts.append(f"({sport.replace('_', ' ')} matchups: timed out. Suggest **Live odds** or *Show live odds*.)")
+        elif result("matchups"):
+            parts.append(result("matchups"))
 
     # Team vs team: ensure we have odds for prediction
-    if "vs" in msg and any(x in msg for x in ("bet", "win", "predict", "who")):
+    if prediction_cue:
         if not any("Use the odds" in p or "favorite" in p for p in parts):
             parts.append("(Use the odds data above to name the favorite and the odds for each side.)")
 
@@ -1167,10 +3618,24 @@ def _normalize_image_url(raw: str) -> Optional[str]:
         return None
 
 
+_openai_client_lock = threading.Lock()
+_openai_client_instance = None
+
+
+def _openai_client():
+    """Shared OpenAI client: one keep-alive connection pool for every chat call instead of a new one per call."""
+    global _openai_client_instance
+    if _openai_client_instance is None:
+        with _openai_client_lock:
+            if _openai_client_instance is None:
+                from openai import OpenAI
+                _openai_client_instance = OpenAI(api_key=OPENAI_API_KEY)
+    return _openai_client_instance
+
+
 def _openai_chat(model: str, messages: list, max_tokens: int = 1024, temperature: float = 0.7):
     """Single OpenAI chat call. Raises on error."""
-    from openai import OpenAI
-    client = OpenAI(api_key=OPENAI_API_KEY)
+    client = _openai_client()
     return client.chat.completions.create(
         model=model,
         messages=messages,
@@ -1194,36 +3659,69 @@ def _build_user_content_with_images(message: str, image_data_urls: List[str]) ->
     return parts
 
 
-def call_openai(
+def _openai_chat_stream(model: str, messages: list, max_tokens: int = 1024, temperature: float = 0.7):
+    """Streaming OpenAI chat call: yields content pieces as they arrive. Raises on error."""
+    client = _openai_client()
+    stream = client.chat.completions.create(
+        model=model,
+        messages=messages,
+        max_tokens=max_tokens,
+        temperature=temperature,
+        stream=True,
+    )
+    for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+
+def _openai_messages(
     system_prompt: str,
     conversation: List[dict],
     context: str = "",
     current_user_content: Optional[list] = None,
-) -> str:
-    """Call OpenAI Chat Completions. If current_user_content is a list (multipart with images), use vision models."""
-    if not OPENAI_API_KEY:
-        return ""
+):
+    """Build (messages, models_to_try) for a chat turn. Multipart current_user_content selects vision models."""
     system = system_prompt
     if context:
         system += "\n\n" + context
     messages = [{"role": "system", "content": system}]
+    for m in conversation:
+        role = "user" if m.get("sender") == "user" else "assistant"
+        content = (m.get("text") or "").strip()
+        if content:
+            messages.append({"role": role, "content": content})
     if current_user_content is not None:
         # Vision turn: history as text, then current user message as multipart
-        for m in conversation:
-            role = "user" if m.get("sender") == "user" else "assistant"
-            content = (m.get("text") or "").strip()
-            if content:
-                messages.append({"role": role, "content": content})
         messages.append({"role": "user", "content": current_user_content})
         models_to_try = [m for m in VISION_MODEL_FALLBACKS]
     else:
-        for m in conversation:
-            role = "user" if m.get("sender") == "user" else "assistant"
-            content = (m.get("text") or "").strip()
-            if content:
-                messages.append({"role": role, "content": content})
         models_to_try = [OPENAI_MODEL] + [m for m in OPENAI_MODEL_FALLBACKS if m != OPENAI_MODEL]
+    return messages, models_to_try
+
+
+def _openai_error_reply(err: str) -> Optional[str]:
+    """Reply text for an OpenAI error, or None when the next fallback model should be tried."""
+    if "403" in err and ("Project" in err or "billing" in err.lower()) and not _is_model_access_error(err):
+        return "(LLM error: 403 - Your BetAI project has $0 billing. Add payment to that project at platform.openai.com (Billing), or create an API key in the project that has your $10 (e.g. Default) and set OPENAI_API_KEY on Render to that key. See OPENAI-BILLING-FIX.md.)"
+    if _is_model_access_error(err):
+        return None
+    return f"(LLM error: {err})"
+
 
+def _no_model_reply(last_error: str) -> str:
+    return f"(LLM error: No model available for this project. Last error: {last_error[:120]}… — Try setting OPENAI_MODEL on Render to a model your project can use; see platform.openai.com/docs/models.)"
+
+
+def call_openai(
+    system_prompt: str,
+    conversation: List[dict],
+    context: str = "",
+    current_user_content: Optional[list] = None,
+) -> str:
+    """Call OpenAI Chat Completions. If current_user_content is a list (multipart with images), use vision models."""
+    if not OPENAI_API_KEY:
+        return ""
+    messages, models_to_try = _openai_messages(system_prompt, conversation, context, current_user_content)
     last_error = None
     for model in models_to_try:
         try:
@@ -1231,18 +3729,51 @@ def call_openai(
             if r.choices and len(r.choices) > 0:
                 return (r.choices[0].message.content or "").strip()
         except Exception as e:
-            err = str(e)
-            last_error = err
-            if "403" in err and ("Project" in err or "billing" in err.lower()) and not _is_model_access_error(err):
-                return "(LLM error: 403 - Your BetAI project has $0 billing. Add payment to that project at platform.openai.com (Billing), or create an API key in the project that has your $10 (e.g. Default) and set OPENAI_API_KEY on Render to that key. See OPENAI-BILLING-FIX.md.)"
-            if _is_model_access_error(err):
+            last_error = str(e)
+            reply = _openai_error_reply(last_error)
+            if reply is None:
                 continue  # try next model
-            return f"(LLM error: {e!s})"
+            return reply
     if last_error:
-        return f"(LLM error: No model available for this project. Last error: {last_error[:120]}… — Try setting OPENAI_MODEL on Render to a model your project can use; see platform.openai.com/docs/models.)"
+        return _no_model_reply(last_error)
     return ""
 
 
+def stream_openai(
+    system_prompt: str,
+    conversation: List[dict],
+    context: str = "",
+    current_user_content: Optional[list] = None,
+):
+    """Like call_openai, but yields the reply in pieces as the model produces them.
+    A model that fails before its first token falls through to the next fallback model;
+    errors are yielded as the same "(LLM error: ...)" text call_openai returns."""
+    if not OPENAI_API_KEY:
+        return
+    messages, models_to_try = _openai_messages(system_prompt, conversation, context, current_user_content)
+    last_error = None
+    for model in models_to_try:
+        started = False
+        try:
+            for piece in _openai_chat_stream(model, messages):
+                started = True
+                yield piece
+            return
+        except Exception as e:
+            last_error = str(e)
+            if started:
+                # Mid-reply failure: the user already has part of the answer, so just flag the cut-off
+                yield f"\n\n(LLM error: reply interrupted — {e!s})"
+                return
+            reply = _openai_error_reply(last_error)
+            if reply is None:
+                continue  # try next model
+            yield reply
+            return
+    if last_error:
+        yield _no_model_reply(last_error)
+
+
 # ============================================================================
 # CONTEXTUAL MEMORY FUNCTIONS
 # ============================================================================
@@ -1284,45 +3815,153 @@ def generate_conversation_summary(messages: List[dict], max_messages: int = 10)
     return ""
 
 
-def extract_chat_metadata(messages: List[dict]) -> dict:
-    """Extract key metadata from chat history for contextual memory."""
-    metadata = {
-        "teams_mentioned": set(),
-        "sports_discussed": set(),
-        "bet_types_mentioned": set(),
-    }
+# Team vocabulary for chat memory: keyword (lowercase, whole words) -> name stored in preferences
+_CHAT_TEAM_KEYWORDS = (
+    # NBA
+    "hawks", "celtics", "nets", "hornets", "bulls", "cavaliers", "mavericks", "nuggets", "pistons",
+    "warriors", "rockets", "pacers", "clippers", "lakers", "grizzlies", "heat", "bucks", "timberwolves",
+    "pelicans", "knicks", "thunder", "magic", "76ers", "suns", "trail blazers", "kings", "spurs",
+    "raptors", "jazz", "wizards",
+    # NFL
+    "cardinals", "falcons", "ravens", "bills", "panthers", "bears", "bengals", "browns", "cowboys",
+    "broncos", "lions", "packers", "texans", "colts", "jaguars", "chiefs", "raiders", "chargers", "rams",
+    "dolphins", "vikings", "patriots", "saints", "giants", "jets", "eagles", "steelers", "49ers",
+    "seahawks", "buccaneers", "commanders", "titans",
+    # NHL
+    "ducks", "bruins", "sabres", "flames", "hurricanes", "blackhawks", "avalanche", "blue jackets",
+    "stars", "red wings", "oilers", "wild", "canadiens", "predators", "devils", "islanders", "rangers",
+    "senators", "flyers", "penguins", "sharks", "kraken", "blues", "lightning", "maple leafs", "canucks",
+    "golden knights", "capitals",
+    # MLB
+    "diamondbacks", "braves", "orioles", "red sox", "cubs", "white sox", "reds", "guardians", "rockies",
+    "tigers", "astros", "royals", "angels", "dodgers", "marlins", "brewers", "twins", "mets", "yankees",
+    "athletics", "phillies", "pirates", "padres", "mariners", "rays", "blue jays", "nationals",
+    # Soccer
+    "liverpool", "chelsea", "arsenal", "tottenham", "tottenham hotspur", "manchester united",
+    "manchester city", "everton", "newcastle united", "aston villa", "west ham", "brighton", "brentford",
+    "fulham", "crystal palace", "wolverhampton", "nottingham forest", "bournemouth", "barcelona",
+    "real madrid", "atletico madrid", "bayern", "bayern munich", "dortmund", "psg", "paris saint germain",
+    "juventus", "inter milan", "ac milan", "milan", "napoli", "ajax", "benfica", "porto",
+)
+_CHAT_BET_TYPES = {
+    "spread": "spread", "spreads": "spread", "moneyline": "moneyline", "money line": "moneyline",
+    "over": "over", "under": "under", "parlay": "parlay", "parlays": "parlay", "prop": "prop",
+    "props": "prop", "futures": "futures",
+}
+_CHAT_SPORT_WORDS = {
+    "nba": "basketball", "basketball": "basketball",
+    "nfl": "american_football", "football": "american_football",
+    "soccer": "soccer", "premier league": "soccer", "champions league": "soccer",
+    "nhl": "hockey", "hockey": "hockey", "mlb": "baseball", "baseball": "baseball",
+}
 
-    # Common team keywords for various sports
-    nba_teams = ["lakers", "celtics", "warriors", "heat", "bulls", "knicks", "nets", "76ers",
-                 "bucks", "raptors", "mavericks", "rockets", "spurs", "nuggets", "clippers"]
-    nfl_teams = ["patriots", "chiefs", "49ers", "cowboys", "packers", "steelers", "eagles", "rams"]
-    soccer_teams = ["liverpool", "manchester", "chelsea", "arsenal", "barcelona", "real madrid",
-                    "bayern", "psg", "juventus", "milan", "city", "united"]
 
-    bet_types = ["spread", "moneyline", "over", "under", "parlay", "prop", "futures"]
+# Team keyword words written as acronyms ("PSG", "AC Milan"); everything else is title-cased
+_CHAT_TEAM_ACRONYMS = frozenset(("psg", "ac", "fc", "afc"))
 
-    for msg in messages:
-        text = msg.get("text", "").lower()
 
-        # Extract teams
-        for team in nba_teams + nfl_teams + soccer_teams:
-            if team in text:
-                metadata["teams_mentioned"].add(team.title())
+def _chat_team_display(keyword: str) -> str:
+    return " ".join(w.upper() if w in _CHAT_TEAM_ACRONYMS else w.capitalize() for w in keyword.split())
 
-        # Extract bet types
-        for bet_type in bet_types:
-            if bet_type in text:
-                metadata["bet_types_mentioned"].add(bet_type)
 
-        # Extract sports
-        if any(word in text for word in ["nba", "basketball"]):
-            metadata["sports_discussed"].add("basketball")
-        if any(word in text for word in ["nfl", "football"]):
-            metadata["sports_discussed"].add("american_football")
-        if any(word in text for word in ["soccer", "premier league", "champions league"]):
-            metadata["sports_discussed"].add("soccer")
+def _build_chat_vocabulary() -> dict:
+    """phrase -> (kind, value) for every team keyword, nickname, bet type and sport word."""
+    vocab = {}
+    for kw in _CHAT_TEAM_KEYWORDS:
+        vocab[kw] = ("team", _chat_team_display(kw))
+    # Nicknames ("sixers", "man utd") resolve to the keyword their full team name ends with
+    for alias, full in TEAM_NICKNAMES.items():
+        for kw in _CHAT_TEAM_KEYWORDS:
+            if full == kw or full.endswith(" " + kw):
+                vocab.setdefault(alias, ("team", _chat_team_display(kw)))
+                break
+    for phrase, bet_type in _CHAT_BET_TYPES.items():
+        vocab[phrase] = ("bet", bet_type)
+    for phrase, sport in _CHAT_SPORT_WORDS.items():
+        vocab[phrase] = ("sport", sport)
+    return vocab
+
+
+_chat_vocabulary = _build_chat_vocabulary()
+_chat_matcher = PatternAutomaton(_chat_vocabulary)
+
+
+class ChatMetadata:
+    """Teams, bet types and sports mentioned in one chat, folded in message by message.
+    seen/tail record how much of the history has been scanned, so the next turn only scans new messages."""
+
+    __slots__ = ("seen", "tail", "teams", "bet_types", "sports", "summary", "summary_upto")
+
+    def __init__(self):
+        self.seen = 0
+        self.tail = None
+        self.teams = {}  # insertion-ordered set
+        self.bet_types = {}
+        self.sports = {}
+        self.summary = ""
+        self.summary_upto = 0
+
+    def add_text(self, text: str):
+        text = (text or "").lower()
+        for start, phrase in _chat_matcher.finditer(text):
+            end = start + len(phrase)
+            # Whole words only ("heat" not in "wheat", "under" not in "understand")
+            if (start and text[start - 1].isalnum()) or (end < len(text) and text[end].isalnum()):
+                continue
+            kind, value = _chat_vocabulary[phrase]
+            target = self.teams if kind == "team" else self.bet_types if kind == "bet" else self.sports
+            target[value] = None
+
+    def update(self, messages: List[dict]) -> "ChatMetadata":
+        """Scan messages[seen:]; start over if the history no longer extends what was scanned."""
+        if self.seen > len(messages) or (self.seen and (messages[self.seen - 1].get("text") or "") != self.tail):
+            self.__init__()
+        for m in messages[self.seen:]:
+            self.add_text(m.get("text", ""))
+        if len(messages) > self.seen:
+            self.seen = len(messages)
+            self.tail = messages[-1].get("text") or ""
+        return self
+
+    def as_dict(self) -> dict:
+        return {
+            "teams_mentioned": list(self.teams),
+            "sports_discussed": list(self.sports),
+            "bet_types_mentioned": list(self.bet_types),
+        }
+
+
+CHAT_MEMORY_MAX_CHATS = int(os.getenv("CHAT_MEMORY_MAX_CHATS", "2000") or "2000")
+_chat_metadata = {}  # chat key -> ChatMetadata, least recently used first
+_chat_metadata_lock = threading.Lock()
+
+
+def chat_key(user_id: Optional[str], chat_id: Optional[str], messages: List[dict], sport: str = "") -> Optional[tuple]:
+    """Identity of a conversation: the client's chat id, else its sport + first message (stable across turns;
+    chats opened from the same quick prompt in different sports stay apart)."""
+    if chat_id:
+        return (user_id, str(chat_id))
+    first = next((m.get("text") for m in messages if (m.get("text") or "").strip()), None)
+    if not first:
+        return None
+    return (user_id, f"first:{sport}:" + first[:500])
 
-    return {k: list(v) if isinstance(v, set) else v for k, v in metadata.items()}
+
+def chat_metadata_state(key: Optional[tuple], messages: List[dict]) -> ChatMetadata:
+    """Stored metadata for the chat, brought up to date with any messages not yet scanned."""
+    if key is None:
+        return ChatMetadata().update(messages)
+    with _chat_metadata_lock:
+        state = _chat_metadata.pop(key, None) or ChatMetadata()
+        _chat_metadata[key] = state
+        while len(_chat_metadata) > CHAT_MEMORY_MAX_CHATS:
+            _chat_metadata.pop(next(iter(_chat_metadata)))
+        return state.update(messages)
+
+
+def extract_chat_metadata(messages: List[dict], key: Optional[tuple] = None) -> dict:
+    """Extract key metadata from chat history for contextual memory (incremental when key is given)."""
+    return chat_metadata_state(key, messages).as_dict()
 
 
 def load_user_preferences(user_id: str) -> dict:
@@ -1387,8 +4026,9 @@ def update_user_preferences_from_chat(user_id: str, metadata: dict):
     save_user_preferences(user_id, prefs)
 
 
-def build_memory_context(user_id: str, messages: List[dict], sport: str) -> str:
-    """Build comprehensive memory context from user preferences and conversation history."""
+def build_memory_context(user_id: str, messages: List[dict], sport: str, key: Optional[tuple] = None) -> str:
+    """Build comprehensive memory context from user preferences and conversation history.
+    With a chat key, metadata and the long-chat summary come from that chat's stored state."""
     if not user_id:
         return ""
 
@@ -1403,14 +4043,19 @@ def build_memory_context(user_id: str, messages: List[dict], sport: str) -> str:
         bets_str = ", ".join(prefs["preferred_bet_types"])
         context_parts.append(f"User's preferred bet types: {bets_str}")
 
-    # Generate conversation summary for long chats
+    state = chat_metadata_state(key, messages)
+    # Generate conversation summary for long chats; a stored one is reused until 10 more messages age out of it
     if len(messages) > 15:
-        summary = generate_conversation_summary(messages, max_messages=10)
+        summary = state.summary
+        if not summary or len(messages) - 10 - state.summary_upto >= 10:
+            summary = generate_conversation_summary(messages, max_messages=10) or summary
+            if summary and key is not None:
+                state.summary, state.summary_upto = summary, len(messages) - 10
         if summary:
             context_parts.append(f"Previous conversation context: {summary}")
 
     # Extract current conversation metadata
-    metadata = extract_chat_metadata(messages)
+    metadata = state.as_dict()
     if metadata.get("teams_mentioned"):
         teams_str = ", ".join(metadata["teams_mentioned"][:10])
         context_parts.append(f"Teams discussed in this chat: {teams_str}")
@@ -1427,20 +4072,17 @@ def handle_chat_message(message: str, sport: str) -> str:
     msg = message.lower().strip()
     api_key = SPORT_KEY_MAP.get(sport, SPORT_KEY_MAP["basketball"])
 
+    intents = chat_intents(message)
+
     # —— Live odds: propose live/upcoming across all sports
-    if any(x in msg for x in (
-        "live", "in play", "in-play", "right now", "currently playing",
-        "what's on", "whats on", "games on now", "live odds", "any games",
-        "all games", "games today", "load up all", "load all games", "every game",
-        "all today", "upcoming games", "show all games", "list all games",
-    )):
+    if "live" in intents:
         by_sport = fetch_live_upcoming_odds()
         if isinstance(by_sport, dict) and "error" in by_sport:
             return f"Couldn’t load live odds: {by_sport['error']}. I can still show **upcoming matchups** for a sport — try *Show matchups* or pick a sport above."
         return format_live_upcoming_reply(by_sport)
 
     # —— Milano Cortina / Olympics
-    if any(x in msg for x in ("olympics", "milano", "cortina", "milano cortina", "2026 winter")):
+    if "olympics" in intents:
         odds = fetch_olympics_odds()
         if odds:
             return get_matchups("olympics")
@@ -1451,23 +4093,21 @@ def handle_chat_message(message: str, sport: str) -> str:
         )
 
     # —— Sport-specific matchups
-    if "matchups" in msg or "show games" in msg or ("upcoming" in msg and "live" not in msg):
+    if "matchups" in intents or ("upcoming" in intents and "live_word" not in intents):
         return get_matchups(sport)
 
-    if "vs" in msg and (
-        "bet on" in msg or "who will win" in msg or "who should i bet" in msg or "predict" in msg
-    ):
+    if "versus" in intents and "prediction" in intents:
         parts = msg.split("vs", 1)
         if len(parts) == 2:
             t1 = parts[0].replace("should i bet on", "").replace("who will win", "").strip().split()[-2:] or parts[0].strip()
             t2 = parts[1].strip()
             if isinstance(t1, list):
                 t1 = " ".join(t1)
-            odds = fetch_odds_data(api_key)
+            odds = current_odds(api_key)
             return predict_outcome(t1, t2, odds)
         return "Please ask with two teams, e.g. *Who will win Lakers vs Celtics?*"
 
-    if "odds" in msg or "compare" in msg:
+    if "odds" in intents:
         return get_matchups(sport)
 
     # —— Conversational default: agent tone, suggest live + Olympics
@@ -1548,6 +4188,24 @@ def auth_me():
 
 # ——— Routes ———
 
+@app.before_request
+def _start_background_services():
+    ensure_odds_snapshot_started()
+    ensure_espn_refresh_started()
+
+
+@app.before_request
+def _open_request_memo():
+    g.request_memo_token = begin_request_memo()
+
+
+@app.teardown_request
+def _close_request_memo(exc=None):
+    token = g.pop("request_memo_token", None)
+    if token is not None:
+        end_request_memo(token, label=f"{request.method} {request.path}")
+
+
 @app.route("/")
 def index():
     """Backend API root — frontend is on Netlify"""
@@ -1621,8 +4279,96 @@ VISION_SYSTEM_ADDON = (
 )
 
 
+def _llm_turn(message: str, sport: str, history: list, images: list, user_id: Optional[str],
+              key: Optional[tuple] = None) -> dict:
+    """Assemble the call_openai / stream_openai arguments for one chat turn (memory + odds context)."""
+    sport_label = sport.replace("_", " ").title()
+
+    # Build memory context from user preferences and conversation history
+    memory_context = build_memory_context(user_id, history, sport, key) if user_id else ""
+
+    # Build odds context
+    odds_context = build_odds_context(message or "Describe this image and answer any question about it.", sport)
+
+    # Combine memory and odds context
+    full_context = odds_context
+    if memory_context:
+        full_context = memory_context + "\n\n" + odds_context
+
+    conversation = list(history)
+    # If images provided, do not append a text-only user message; we'll send multipart
+    image_urls = [u for u in images if u][:5]  # max 5 images
+    if image_urls:
+        return {
+            "system_prompt": SYSTEM_PROMPT.format(sport_label=sport_label) + VISION_SYSTEM_ADDON,
+            "conversation": conversation,
+            "context": full_context,
+            "current_user_content": _build_user_content_with_images(message, image_urls),
+        }
+    conversation.append({"sender": "user", "text": message})
+    return {
+        "system_prompt": SYSTEM_PROMPT.format(sport_label=sport_label),
+        "conversation": conversation,
+        "context": full_context,
+    }
+
+
+def _remember_chat_turn(user_id: Optional[str], history: list, message: str, key: Optional[tuple] = None):
+    """Update user preferences after a successful LLM reply."""
+    if not user_id:
+        return
+    try:
+        metadata = extract_chat_metadata(history + [{"sender": "user", "text": message}], key)
+        update_user_preferences_from_chat(user_id, metadata)
+    except Exception as e:
+        print(f"Failed to update user preferences: {e}", flush=True)
+
+
+def _fallback_reply(message: str, sport: str, llm_error: str) -> str:
+    """Rule-based reply used when the LLM is not configured or failed, with a hint about why."""
+    reply = handle_chat_message(message or "What's in this image?", sport)
+    if llm_error == "not_configured":
+        reply += "\n\n_To get **real AI replies**, add **OPENAI_API_KEY** in Render: Dashboard → your service (betAI) → Environment → Add variable OPENAI_API_KEY = your OpenAI key._"
+    elif llm_error:
+        if "403" in llm_error or "BetAI project" in llm_error:
+            reply += "\n\n_**AI replies are off:** Your OpenAI **BetAI** project has **$0** billing. Either add payment to that project, or create an API key in the project that has your $10 (e.g. **Default**), then set that key as OPENAI_API_KEY on Render and redeploy. See repo file **OPENAI-BILLING-FIX.md** for steps._"
+        else:
+            err_preview = (llm_error[:80] + "…") if len(llm_error) > 80 else llm_error
+            reply += "\n\n_(LLM failed: " + err_preview + " — check OPENAI_API_KEY on Render.)_"
+    return reply
+
+
+def _stream_chat(message: str, sport: str, history: list, images: list, user_id: Optional[str],
+                 key: Optional[tuple] = None):
+    """SSE body for a streamed /chat turn: `token` events as text arrives, then `done` with the full reply."""
+    yield "retry: 5000\n\n"
+    llm_error = None
+    if OPENAI_API_KEY:
+        pieces = []
+        for piece in stream_openai(**_llm_turn(message, sport, history, images, user_id, key)):
+            if not pieces and piece.startswith("(LLM error:"):
+                llm_error = piece
+                break
+            pieces.append(piece)
+            yield _sse("token", {"text": piece})
+        reply = "".join(pieces).strip()
+        if reply:
+            _remember_chat_turn(user_id, history, message, key)
+            yield _sse("done", {"reply": reply})
+            return
+        llm_error = llm_error or "No response from LLM"
+    else:
+        llm_error = "not_configured"
+    reply = _fallback_reply(message, sport, llm_error)
+    yield _sse("token", {"text": reply})
+    yield _sse("done", {"reply": reply})
+
+
 @app.route("/chat", methods=["POST"])
 def chat():
+    """Chat turn. Send {"stream": true} (or Accept: text/event-stream) to receive the reply as
+    Server-Sent Events (`token` pieces, then `done`) instead of one JSON body. An optional "chat_id"
+    identifies the conversation for per-chat memory (otherwise its first message does)."""
     data = request.get_json() or {}
     message = (data.get("message") or "").strip()
     sport = (data.get("sport") or "basketball").lower().replace(" ", "_")
@@ -1631,67 +4377,72 @@ def chat():
     if not message and not images:
         return jsonify({"reply": "Send a message or attach an image to get advice."}), 400
 
-    # Get user for memory context
+    # Get user for memory context; chat metadata is kept per conversation and only scans new messages
     user_id = get_user_from_request()
+    key = chat_key(user_id, data.get("chat_id"), history + [{"sender": "user", "text": message}], sport) if user_id else None
+
+    if data.get("stream") or "text/event-stream" in (request.headers.get("Accept") or ""):
+        return Response(
+            stream_with_context(_stream_chat(message, sport, history, images, user_id, key)),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
 
     # Use real LLM when OpenAI key is set
     llm_error = None
     if OPENAI_API_KEY:
-        sport_label = sport.replace("_", " ").title()
-
-        # Build memory context from user preferences and conversation history
-        memory_context = build_memory_context(user_id, history, sport) if user_id else ""
-
-        # Build odds context
-        odds_context = build_odds_context(message or "Describe this image and answer any question about it.", sport)
-
-        # Combine memory and odds context
-        full_context = odds_context
-        if memory_context:
-            full_context = memory_context + "\n\n" + odds_context
-
-        conversation = list(history)
-        # If images provided, do not append a text-only user message; we'll send multipart
-        image_urls = [u for u in images if u][:5]  # max 5 images
-        if image_urls:
-            current_content = _build_user_content_with_images(message, image_urls)
-            system = SYSTEM_PROMPT.format(sport_label=sport_label) + VISION_SYSTEM_ADDON
-            reply = call_openai(
-                system,
-                conversation,
-                context=full_context,
-                current_user_content=current_content,
-            )
-        else:
-            conversation.append({"sender": "user", "text": message})
-            reply = call_openai(
-                SYSTEM_PROMPT.format(sport_label=sport_label),
-                conversation,
-                context=full_context,
-            )
+        reply = call_openai(**_llm_turn(message, sport, history, images, user_id, key))
         if reply and not reply.startswith("(LLM error:"):
             # Update user preferences after successful chat
-            if user_id:
-                try:
-                    metadata = extract_chat_metadata(history + [{"sender": "user", "text": message}])
-                    update_user_preferences_from_chat(user_id, metadata)
-                except Exception as e:
-                    print(f"Failed to update user preferences: {e}", flush=True)
+            _remember_chat_turn(user_id, history, message, key)
             return jsonify({"reply": reply})
         llm_error = reply if reply else "No response from LLM"
     else:
         llm_error = "not_configured"
 
-    reply = handle_chat_message(message or "What's in this image?", sport)
-    if llm_error == "not_configured":
-        reply += "\n\n_To get **real AI replies**, add **OPENAI_API_KEY** in Render: Dashboard → your service (betAI) → Environment → Add variable OPENAI_API_KEY = your OpenAI key._"
-    elif llm_error:
-        if "403" in llm_error or "BetAI project" in llm_error:
-            reply += "\n\n_**AI replies are off:** Your OpenAI **BetAI** project has **$0** billing. Either add payment to that project, or create an API key in the project that has your $10 (e.g. **Default**), then set that key as OPENAI_API_KEY on Render and redeploy. See repo file **OPENAI-BILLING-FIX.md** for steps._"
+    return jsonify({"reply": _fallback_reply(message, sport, llm_error)})
+
+
+# Time budget for /analyze team/player enrichment; slower sources come back as timed out
+ANALYZE_ENRICH_BUDGET = float(os.getenv("ANALYZE_ENRICH_BUDGET", "10") or "10")
+
+
+def _team_enrichment_stages(team_stage: str) -> dict:
+    """Lookups keyed off a resolved TheSportsDB team: recent form and league table, both started
+    as soon as team_stage yields idTeam / idLeague."""
+    return {
+        "recent_form": ((team_stage,), lambda team: fetch_recent_form(team["idTeam"]) if team.get("idTeam") else []),
+        "league_table": ((team_stage,), lambda team: fetch_league_table(team["idLeague"]) if team.get("idLeague") else []),
+    }
+
+
+def enrich_analysis(analysis_type: str, query: str, sport: str) -> dict:
+    """Team or player enrichment for /analyze: every TheSportsDB lookup starts as soon as its inputs
+    are known. Returns the combined result plus per-source timings (ms); sources that miss
+    ANALYZE_ENRICH_BUDGET are listed under timed_out and the rest are returned as they are."""
+    if analysis_type == "team":
+        stages = {"team_details": ((), lambda: fetch_team_details(query, sport))}
+        stages.update(_team_enrichment_stages("team_details"))
+    else:
+        stages = {
+            "player": ((), lambda: fetch_player_stats(query)),
+            # The player's club is known once the player resolves; its form and table follow from there
+            "team_details": (("player",), lambda p: fetch_team_details(p["strTeam"], sport) if p.get("strTeam") else {}),
+        }
+        stages.update(_team_enrichment_stages("team_details"))
+    results, timings = run_pipeline(stages, ANALYZE_ENRICH_BUDGET, label=f"analyze-{analysis_type}")
+
+    result = {"timings": {name: round(sec * 1000) for name, sec in timings.items()}, "timed_out": []}
+    for name, value in results.items():
+        if value is _TIMED_OUT:
+            result["timed_out"].append(name)
+        elif isinstance(value, Exception):
+            result.setdefault("errors", {})[name] = str(value)
+        elif name == "player":
+            result["player_stats"] = format_player_stats_for_llm(value)
         else:
-            err_preview = (llm_error[:80] + "…") if len(llm_error) > 80 else llm_error
-            reply += "\n\n_(LLM failed: " + err_preview + " — check OPENAI_API_KEY on Render.)_"
-    return jsonify({"reply": reply})
+            result[name] = value
+    return result
 
 
 @app.route("/analyze", methods=["POST"])
@@ -1702,7 +4453,7 @@ def analyze_matchup():
         return jsonify({"error": "Log in to get analysis"}), 401
 
     body = request.get_json() or {}
-    analysis_type = body.get("type", "matchup")  # matchup, player, team, fantasy
+    analysis_type = body.get("type", "matchup")  # matchup, player, team, fantasy, categories
     query = body.get("query", "")
     sport = body.get("sport", "basketball")
 
@@ -1712,42 +4463,36 @@ def analyze_matchup():
         # Analyze specific matchup with odds, spreads, H2H
         result["odds_analysis"] = build_odds_context(query, sport)
 
-    elif analysis_type == "player":
-        # Analyze specific player
-        player_name = query
-        player_data = fetch_player_stats(player_name)
-        result["player_stats"] = format_player_stats_for_llm(player_data)
-
-    elif analysis_type == "team":
-        # Analyze team with recent form, standings
-        team_name = query
-        team_details = fetch_team_details(team_name, sport)
-        result["team_details"] = team_details
-        if team_details.get("idTeam"):
-            result["recent_form"] = fetch_recent_form(team_details["idTeam"])
+    elif analysis_type in ("player", "team"):
+        # Player stats / team details with recent form and standings, fetched in parallel
+        result = enrich_analysis(analysis_type, query, sport)
 
     elif analysis_type == "fantasy":
         # Fantasy basketball comprehensive analysis
         try:
-            from espn_api.basketball import League
-            league = League(
-                league_id=int(ESPN_LEAGUE_ID),
-                year=ESPN_YEAR,
-                espn_s2=ESPN_S2,
-                swid=ESPN_SWID,
-            )
-            fa = league.free_agents(size=50)
-            result["comprehensive_analysis"] = comprehensive_fantasy_analysis(fa, top_n=20)
-            result["trending"] = analyze_fantasy_trending_players(fa)
+            pool = league_player_pool(ESPN_YEAR)
+            result["comprehensive_analysis"] = comprehensive_fantasy_analysis(pool, top_n=20)
+            result["trending"] = analyze_fantasy_trending_players(pool)
 
             # If player names provided in query, do comparison
             if query and "vs" in query.lower():
                 player_names = [name.strip() for name in query.lower().split("vs")]
-                result["player_comparison"] = compare_fantasy_players(player_names, fa)
+                result["player_comparison"] = compare_fantasy_players(player_names, pool)
         except Exception as e:
             result["error"] = f"Could not fetch fantasy analysis: {e}"
             result["free_agents_fallback"] = fetch_espn_fantasy_basketball()
 
+    elif analysis_type == "categories":
+        # 9-cat z-score rankings across the league; query may name punted categories ("punt FT% and TO")
+        try:
+            rankings = league_player_pool(ESPN_YEAR).categories()
+            punt = parse_punt_categories(query if "punt" in query.lower() else f"punt {query}")
+            result["punt"] = [dict(FANTASY_CATEGORIES)[name] for name in punt]
+            result["category_rankings"] = rankings.format(punt, limit=25)
+            result["rankings"] = rankings.top(punt, limit=int(body.get("limit") or 50))
+        except Exception as e:
+            result["error"] = f"Could not compute category rankings: {e}"
+
     return jsonify(result)
 
 
@@ -1756,13 +4501,110 @@ def sports_list():
     return jsonify(list(SPORT_KEY_MAP.keys()))
 
 
+@app.route("/value-scan", methods=["GET"])
+def value_scan():
+    """Arbitrage, best-line edges and bookmaker overround across every sport (or ?sport=basketball)."""
+    started = time.perf_counter()
+    sport = (request.args.get("sport") or "").lower().replace(" ", "_")
+    try:
+        limit = max(1, min(100, int(request.args.get("limit", "20"))))
+    except ValueError:
+        limit = 20
+    if sport:
+        if sport not in SPORT_KEY_MAP:
+            return jsonify({"error": f"Unknown sport '{sport}'"}), 400
+        sport_keys = [SPORT_KEY_MAP[sport]]
+    else:
+        sport_keys = sorted(set(SPORT_KEY_MAP.values()))
+    result = scan_value(_scan_universe(sport_keys), limit=limit)
+    result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return jsonify(result)
+
+
+@app.route("/odds/stream", methods=["GET"])
+def odds_stream():
+    """Server-Sent Events: an initial `snapshot` of current moneylines, then `delta` events with only
+    the prices and scores that changed on each background refresh. ?sport=basketball,hockey filters."""
+    requested = [x.strip().lower().replace(" ", "_") for x in (request.args.get("sport") or "").split(",") if x.strip()]
+    unknown = [x for x in requested if x not in SPORT_KEY_MAP]
+    if unknown:
+        return jsonify({"error": f"Unknown sport(s): {', '.join(unknown)}"}), 400
+    sport_keys = {SPORT_KEY_MAP[x] for x in requested} or None
+    q = _odds_stream.subscribe(sport_keys)
+    if q is None:
+        return jsonify({"error": "Too many live odds subscribers; try again shortly"}), 503
+
+    def initial_snapshot() -> dict:
+        events = {}
+        for feed in (sorted(sport_keys) if sport_keys else OddsSnapshot.sport_keys()):
+            data = _odds_snapshot.odds(feed)
+            for (eid, book, outcome), (price, rec) in OddsStream.quote_map(data if isinstance(data, list) else []).items():
+                ev = events.setdefault(eid, {
+                    "event_id": eid, "sport": SPORT_TITLES.get(rec.sport_key, rec.sport_key),
+                    "match": f"{rec.home_team} vs {rec.away_team}", "commence": rec.commence_time, "odds": {},
+                })
+                ev["odds"].setdefault(book, {})[outcome] = price
+        return {"version": _odds_snapshot.version, "events": list(events.values())}
+
+    def generate():
+        try:
+            yield "retry: 5000\n\n"
+            yield _sse("snapshot", initial_snapshot())
+            while True:
+                try:
+                    delta = q.get(timeout=ODDS_STREAM_KEEPALIVE)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                if delta is None:  # fell behind: start over from current state
+                    yield _sse("snapshot", initial_snapshot())
+                else:
+                    yield _sse("delta", delta)
+        finally:
+            _odds_stream.unsubscribe(q)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.route("/line-movement", methods=["GET"])
+def line_movement():
+    """Price history per bookmaker for one event: ?event_id=...&market=h2h|spreads&days=7"""
+    event_id = (request.args.get("event_id") or "").strip()
+    if not event_id:
+        return jsonify({"error": "event_id is required"}), 400
+    market = request.args.get("market", "h2h")
+    if market not in HISTORY_MARKETS:
+        return jsonify({"error": f"market must be one of {', '.join(HISTORY_MARKETS)}"}), 400
+    try:
+        days = max(1, min(ODDS_HISTORY_RETENTION_DAYS, int(request.args.get("days", "7"))))
+    except ValueError:
+        days = 7
+    books = _odds_history.query(event_id, days=days, market=market)
+    return jsonify({"event_id": event_id, "market": market, "days": days, "books": books})
+
+
 @app.route("/status", methods=["GET"])
 def status():
     """Quick check: is the API and LLM configured? (does not expose keys)"""
     return jsonify({
         "ok": True,
+        "server_mode": SERVER_MODE,
         "llm_configured": bool(OPENAI_API_KEY),
         "odds_configured": bool(ODDS_API_KEY and ODDS_API_KEY != "YOUR_ODDS_API_KEY_HERE"),
+        "odds_cache": _odds_cache.stats(),
+        "upstream_requests": _upstream_flights.stats(),
+        "request_memo": dict(_memo_totals),
+        "odds_snapshot": _odds_snapshot.info(),
+        "odds_history": _odds_history.stats(),
+        "sportsdb_cache": _sportsdb_cache.stats(),
+        "espn_leagues": _espn_leagues.state(),
+        "odds_stream_subscribers": _odds_stream.subscriber_count(),
+        "odds_quota": _odds_quota.state(),
+        "odds_schedule": _odds_scheduler.state(),
     })
 
 
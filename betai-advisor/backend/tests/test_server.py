@@ -0,0 +1,95 @@
+import server
+
+
+def _event(i, sport_key, home, away, home_price=1.9, away_price=1.9):
+    return {
+        "id": f"ev{i}", "sport_key": sport_key, "sport_title": sport_key, "commence_time": "2030-01-01T00:00:00Z",
+        "home_team": home, "away_team": away,
+        "bookmakers": [{"key": "draftkings", "title": "DraftKings", "markets": [
+            {"key": "h2h", "outcomes": [{"name": home, "price": home_price}, {"name": away, "price": away_price}]},
+        ]}],
+    }
+
+
+# ---- TeamIndex ----
+
+def _nba_index():
+    games = [
+        ("Washington Wizards", "Minnesota Timberwolves"), ("New York Knicks", "Golden State Warriors"),
+        ("Indiana Pacers", "Boston Celtics"), ("Los Angeles Lakers", "Miami Heat"),
+    ]
+    events = [_event(i, "basketball_nba", home, away) for i, (home, away) in enumerate(games)]
+    return server.TeamIndex(server.odds_frame(events))
+
+
+def test_team_index_ignores_filler_words():
+    index = _nba_index()
+    for text in ("who was", "who was better", "in 10 min", "ny or la", "is it over or under", "whatever"):
+        assert index.resolve(text) == set(), text
+
+
+def test_team_index_prefers_names_over_abbreviations():
+    index = _nba_index()
+    assert index.resolve("was the Celtics") == {"boston celtics"}
+    assert index.resolve("who will win lakers") == {"los angeles lakers"}
+
+
+def test_team_index_abbreviations_as_whole_side_or_capitals():
+    index = _nba_index()
+    assert index.resolve("gsw") == {"golden state warriors"}
+    assert index.resolve("ny") == {"new york knicks"}
+    assert index.resolve("who wins WAS") == {"washington wizards"}
+    assert index.resolve("who wins was") == set()
+
+
+# ---- OddsStream ----
+
+def test_odds_stream_resyncs_subscribers_on_first_feed_load(monkeypatch):
+    stream = server.OddsStream(10)
+    snapshot = server.OddsSnapshot(server.OddsScheduler(server.OddsQuota(0)))
+    events = [_event(1, "basketball_nba", "Los Angeles Lakers", "Boston Celtics", 2.1, 1.8)]
+    monkeypatch.setattr(server, "_odds_stream", stream)
+    monkeypatch.setattr(server, "_odds_snapshot", snapshot)
+    monkeypatch.setattr(server, "ODDS_HISTORY_ENABLED", False)
+    monkeypatch.setattr(server, "_fetch_odds_data_uncached", lambda sport_key, markets, regions: events)
+    nba, hockey = stream.subscribe({"basketball_nba"}), stream.subscribe({"icehockey_nhl"})
+
+    snapshot.refresh("basketball_nba")
+
+    assert nba.get_nowait() is None  # re-snapshot marker: the feed's prices arrive with the new snapshot
+    assert hockey.empty()
+    snapshot.refresh("basketball_nba")
+    assert nba.empty()  # unchanged prices: nothing more to send
+
+
+# ---- Chat intent routing ----
+
+# Trigger lists as the context builder and the rule-based chat handler checked them before the shared router
+_OLD_CONTEXT_LIVE = (
+    "live", "in play", "what's on", "whats on", "games on now", "live odds", "any games",
+    "all games", "games today", "load up all", "load all games", "upcoming games", "show all games",
+)
+_OLD_CHAT_LIVE = _OLD_CONTEXT_LIVE[:2] + (
+    "in-play", "right now", "currently playing", "every game", "all today", "list all games",
+) + _OLD_CONTEXT_LIVE[2:]
+_ROUTING_PHRASES = (
+    "who will win lakers vs celtics right now", "any games today?", "show live odds", "what's on tonight",
+    "currently playing games", "give me every game", "is it in-play yet", "list all games", "upcoming games",
+    "predict the knicks game", "scores", "who should i bet on today", "load up all the games", "all today",
+    "should i pick up a free agent", "olympics odds", "show matchups", "compare the odds",
+)
+
+
+def test_live_routing_matches_previous_trigger_lists():
+    for phrase in _ROUTING_PHRASES:
+        intents = server.chat_intents(phrase)
+        assert ("live_context" in intents) == any(x in phrase for x in _OLD_CONTEXT_LIVE), phrase
+        assert ("live" in intents) == any(x in phrase for x in _OLD_CHAT_LIVE), phrase
+
+
+def test_other_routing_matches_previous_checks():
+    for phrase in _ROUTING_PHRASES:
+        intents = server.chat_intents(phrase)
+        assert ("olympics" in intents) == any(x in phrase for x in ("olympics", "milano", "cortina", "2026 winter"))
+        assert ("matchups" in intents) == ("matchups" in phrase or "show games" in phrase)
+        assert ("odds" in intents) == ("odds" in phrase or "compare" in phrase)
@@ -31,6 +31,12 @@ const SPORTS = [
 
 const AUTOSAVE_DELAY_MS = 1500
 
+// A chat gets its id up front so every turn (including the first) sends the same chat_id
+// and ChatPanel's key never changes mid-request
+function newChat(sport) {
+  return { id: crypto.randomUUID(), sport, title: 'New chat', messages: [] }
+}
+
 function generateTitle(messages) {
   const first = messages.find(m => m.sender === 'user')
   if (!first) return 'New chat'
@@ -43,7 +49,7 @@ export default function App() {
   const [sidebarOpen, setSidebarOpen] = useState(false)
   const [chatsBySport, setChatsBySport] = useState({})
   const [currentSport, setCurrentSport] = useState('basketball')
-  const [currentChat, setCurrentChat] = useState(null) // { id, sport, title, messages }
+  const [currentChat, setCurrentChat] = useState(() => newChat('basketball')) // { id, sport, title, messages }
   const [loading, setLoading] = useState(true)
   const [lastSavedAt, setLastSavedAt] = useState(null)
   const [theme, setTheme] = useState(getStoredTheme)
@@ -82,7 +88,7 @@ export default function App() {
 
   const startNewChat = (sport = currentSport) => {
     setCurrentSport(sport)
-    setCurrentChat({ id: null, sport, title: 'New chat', messages: [] })
+    setCurrentChat(newChat(sport))
     setSidebarOpen(false)
   }
 
@@ -137,7 +143,7 @@ export default function App() {
   const appendMessage = (sender, text, images = null) => {
     setCurrentChat(prev => {
       const msg = images?.length ? { sender, text, images } : { sender, text }
-      if (!prev) return { id: null, sport: currentSport, title: 'New chat', messages: [msg] }
+      if (!prev) return { ...newChat(currentSport), messages: [msg] }
       return {
         ...prev,
         messages: [...prev.messages, msg],
@@ -193,6 +199,7 @@ export default function App() {
         <AnimatePresence mode="wait">
           <ChatPanel
             key={currentChat?.id ?? 'new'}
+            chatId={currentChat?.id}
             sport={currentChat?.sport ?? currentSport}
             sportLabel={SPORTS.find(s => s.key === (currentChat?.sport ?? currentSport))?.label ?? 'Sport'}
             sports={SPORTS}
@@ -17,6 +17,7 @@ const QUICK_PROMPTS = [
 ]
 
 export default function ChatPanel({
+  chatId,
   sport,
   sportLabel,
   sports,
@@ -98,7 +99,7 @@ export default function ChatPanel({
     onSendMessage('user', messageText, imagesToSend.length ? imagesToSend : null)
     setLoading(true)
     try {
-      const { reply } = await sendMessage(messageText, sport, messages, imagesToSend)
+      const { reply } = await sendMessage(messageText, sport, messages, imagesToSend, chatId)
       onSendMessage('bot', reply.replace(/\\n/g, '\n'))
     } catch (e) {
       onSendMessage('bot', `Error: ${e.message || 'Could not reach the API'}. Make sure the backend is running (port 5000) and you opened the app via npm run dev (e.g. http://localhost:3000 or 3001).`)
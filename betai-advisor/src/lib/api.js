@@ -33,10 +33,10 @@ async function request(path, options = {}, requireAuth = false) {
   return res.json();
 }
 
-export async function sendMessage(message, sport, messages = [], images = []) {
+export async function sendMessage(message, sport, messages = [], images = [], chatId = null) {
   return request('/chat', {
     method: 'POST',
-    body: JSON.stringify({ message, sport, messages, images }),
+    body: JSON.stringify({ message, sport, messages, images, chat_id: chatId }),
   });
 }
 